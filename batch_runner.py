@@ -0,0 +1,204 @@
+"""
+Run the scrape + analysis for several leagues in parallel, one process per league.
+
+Leagues are listed in a JSON file:
+
+    [
+      {"league_id": 149388, "season": 2025, "years": [2024, 2025]},
+      {"league_id": 55555, "season": 2025, "espn_s2_env": "OTHER_ESPN_S2", "swid_env": "OTHER_SWID"}
+    ]
+
+Credentials are read from the environment variables named by espn_s2_env / swid_env
+(default ESPN_S2 / SWID), so no secrets need to live in the file. Each league gets its
+own directory under --output-root holding its CSVs, response cache, analysis output
+and logs:
+
+    python batch_runner.py --leagues leagues.json --output-root leagues --workers 4
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import shlex
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from multiprocessing import get_context
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from response_cache import flush_all_stats
+
+REPORT_FILE = 'batch_report.csv'
+
+@dataclass
+class LeagueJob:
+    """One league to scrape and analyze."""
+    league_id: int
+    season: int
+    years: List[int] = field(default_factory=list)
+    espn_s2_env: str = 'ESPN_S2'
+    swid_env: str = 'SWID'
+    output_dir: Optional[str] = None
+
+    def __post_init__(self):
+        self.years = self.years or [self.season]
+
+    def directory(self, output_root: str) -> str:
+        return os.path.abspath(self.output_dir or os.path.join(output_root, f'{self.league_id}_{self.season}'))
+
+def load_jobs(path: str) -> List[LeagueJob]:
+    """Read the league list from a JSON file."""
+    with open(path, 'r') as f:
+        entries = json.load(f)
+    return [LeagueJob(**entry) for entry in entries]
+
+class _ErrorCounter(logging.Handler):
+    """Counts ERROR records; the scraper logs and skips seasons it cannot fetch rather than raising."""
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.count = 0
+
+    def emit(self, record):
+        self.count += 1
+
+@contextlib.contextmanager
+def _league_environment(job: LeagueJob, directory: str, errors: logging.Handler):
+    """Run inside the league's directory with its credentials and a log file, then restore."""
+    previous_cwd = os.getcwd()
+    previous_env = {name: os.environ.get(name) for name in ('ESPN_S2', 'SWID', 'MPLBACKEND')}
+    root = logging.getLogger()
+    previous_handlers = root.handlers[:]
+    
+    os.makedirs(directory, exist_ok=True)
+    handler = logging.FileHandler(os.path.join(directory, 'scrape.log'))
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    root.handlers = [handler, errors]
+    root.setLevel(logging.INFO)
+    
+    for name, source in (('ESPN_S2', job.espn_s2_env), ('SWID', job.swid_env)):
+        value = os.environ.get(source)
+        if value:
+            os.environ[name] = value
+        else:
+            os.environ.pop(name, None)
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    os.chdir(directory)
+    try:
+        yield
+    finally:
+        # Cache hit/miss counters otherwise wait for atexit, long after this league is done
+        flush_all_stats()
+        os.chdir(previous_cwd)
+        handler.close()
+        root.handlers = previous_handlers
+        for name, value in previous_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+def run_league(job: LeagueJob, output_root: str, scraper_args: List[str], analyze: bool = True) -> Dict[str, Any]:
+    """Scrape one league into its directory, then run team_analysis there. Runs in a worker process."""
+    directory = job.directory(output_root)
+    result = {'league_id': job.league_id, 'season': job.season, 'output_dir': directory, 'status': 'ok',
+              'scrape_seconds': 0.0, 'analysis_seconds': 0.0, 'errors_logged': 0, 'error': ''}
+    errors = _ErrorCounter()
+    
+    with _league_environment(job, directory, errors):
+        phase = 'scrape'
+        try:
+            import espn_ff_scraper
+            started = time.perf_counter()
+            argv = ['--league_id', str(job.league_id), '--years', *map(str, job.years), '--output', '.', *scraper_args]
+            espn_ff_scraper.main(argv)
+            result['scrape_seconds'] = time.perf_counter() - started
+            
+            if analyze:
+                phase = 'analysis'
+                import team_analysis
+                # Leagues already run one per process, so the simulations stay in this one
+                team_analysis.configure_league(job.league_id, job.season, simulation_workers=1)
+                started = time.perf_counter()
+                with open('analysis.log', 'w') as log, contextlib.redirect_stdout(log):
+                    team_analysis.main()
+                result['analysis_seconds'] = time.perf_counter() - started
+        except BaseException as e:
+            logging.exception(f"League {job.league_id} {job.season} failed during {phase}")
+            result['status'] = f'failed ({phase})'
+            result['error'] = repr(e)
+    
+    result['errors_logged'] = errors.count
+    if result['status'] == 'ok' and errors.count:
+        result['status'] = 'errors logged'
+    result['total_seconds'] = result['scrape_seconds'] + result['analysis_seconds']
+    return result
+
+def run_batch(jobs: List[LeagueJob], output_root: str, workers: int, scraper_args: List[str],
+              analyze: bool = True) -> pd.DataFrame:
+    """Run every job on a process pool and return the timing report (one row per league)."""
+    os.makedirs(output_root, exist_ok=True)
+    results = []
+    started = time.perf_counter()
+    
+    # spawn plus one task per child gives every league a clean interpreter: no inherited
+    # threads, caches or module state (team_analysis globals, the lru_cached API client)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'),
+                             max_tasks_per_child=1) as executor:
+        futures = {executor.submit(run_league, job, output_root, scraper_args, analyze): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker process itself died (e.g. out of memory)
+                result = {'league_id': job.league_id, 'season': job.season, 'output_dir': job.directory(output_root),
+                          'status': 'failed (worker)', 'scrape_seconds': 0.0, 'analysis_seconds': 0.0,
+                          'errors_logged': 0, 'total_seconds': 0.0, 'error': repr(e)}
+            logging.info(f"League {result['league_id']} {result['season']}: {result['status']} "
+                         f"in {result['total_seconds']:.1f}s")
+            results.append(result)
+    
+    wall_seconds = time.perf_counter() - started
+    columns = ['league_id', 'season', 'status', 'scrape_seconds', 'analysis_seconds', 'total_seconds',
+               'errors_logged', 'output_dir', 'error']
+    report = pd.DataFrame(results, columns=columns).sort_values(['league_id', 'season'], ignore_index=True)
+    report.to_csv(os.path.join(output_root, REPORT_FILE), index=False)
+    
+    busy_seconds = report['total_seconds'].sum()
+    logging.info(f"Batch finished: {len(report)} leagues, {(report['status'] == 'ok').sum()} ok, "
+                 f"wall {wall_seconds:.1f}s vs {busy_seconds:.1f}s of league work "
+                 f"({busy_seconds / wall_seconds if wall_seconds else 0:.1f}x parallel speedup)")
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description='Scrape and analyze several ESPN leagues in parallel')
+    parser.add_argument('--leagues', type=str, required=True,
+                      help='JSON file listing {league_id, season[, years, espn_s2_env, swid_env, output_dir]}')
+    parser.add_argument('--output-root', type=str, default='leagues',
+                      help='Directory holding one output directory per league (default: leagues)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                      help='Leagues processed at once (default: CPU count)')
+    parser.add_argument('--skip-analysis', action='store_true',
+                      help='Only scrape; do not run team_analysis.py')
+    parser.add_argument('--scraper-args', type=str, default='',
+                      help='Extra espn_ff_scraper.py options for every league, e.g. --scraper-args="--concurrency 4"')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
+                        handlers=[logging.StreamHandler(sys.stdout)])
+
+    jobs = load_jobs(args.leagues)
+    report = run_batch(jobs, args.output_root, max(args.workers, 1), shlex.split(args.scraper_args),
+                       analyze=not args.skip_analysis)
+    print(report[['league_id', 'season', 'status', 'scrape_seconds', 'analysis_seconds', 'total_seconds',
+                  'errors_logged']]
+          .to_string(index=False, float_format=lambda x: f'{x:.1f}'))
+    if (report['status'] != 'ok').any():
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
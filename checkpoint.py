@@ -0,0 +1,143 @@
+"""Crash-safe checkpoint manifest for long multi-season scrapes."""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Dict, List, Tuple
+
+from config import CHECKPOINT_FILE
+
+DIGEST_BYTES = 4096  # Bytes just before each committed offset that are hashed to recognise the same file
+
+def _tail_digest(file_path: str, offset: int) -> str:
+    """sha256 of the DIGEST_BYTES bytes ending at offset."""
+    start = max(offset - DIGEST_BYTES, 0)
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+class CheckpointManifest:
+    """
+    Records which (season, week) units have been fully written to the output CSVs.
+
+    Once a unit has been appended to every CSV the files are fsynced; only then is the
+    manifest rewritten (temp file plus rename) with the new unit and each CSV's byte
+    length. A crash part-way through a unit therefore leaves bytes past the recorded
+    lengths, which `restore` truncates away before a resumed run continues. A digest of
+    the bytes before each length guards against truncating a file that was rewritten
+    since (by an --incremental upsert, say) rather than appended to.
+    """
+    def __init__(self, output_dir: str, run_key: Dict):
+        self.path = os.path.join(output_dir, CHECKPOINT_FILE)
+        self.output_dir = output_dir
+        self.run_key = run_key
+        self.completed = set()
+        self.offsets = {}
+        self.digests = {}
+
+    def load(self) -> bool:
+        """Load a manifest for the same run. Returns False if none exists or it belongs to another run."""
+        if not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            return False
+
+        if manifest.get('run') != self.run_key:
+            logging.warning(f"Checkpoint {self.path} was written for a different run - starting fresh")
+            return False
+
+        self.completed = {tuple(unit) for unit in manifest.get('completed', [])}
+        self.offsets = manifest.get('offsets', {})
+        self.digests = manifest.get('digests', {})
+        return True
+
+    def matches(self, filenames: List[str]) -> bool:
+        """Whether every CSV still starts with the bytes this manifest committed."""
+        for filename in filenames:
+            file_path = os.path.join(self.output_dir, filename)
+            committed = self.offsets.get(filename, 0)
+            if committed == 0:
+                continue
+            if not os.path.exists(file_path) or os.path.getsize(file_path) < committed:
+                logging.warning(f"{filename} is shorter than checkpoint {self.path} recorded")
+                return False
+            digest = self.digests.get(filename)
+            if digest is not None and _tail_digest(file_path, committed) != digest:
+                logging.warning(f"{filename} was rewritten after checkpoint {self.path}")
+                return False
+        return True
+
+    def restore(self, filenames: List[str]) -> bool:
+        """
+        Truncate each CSV to its last committed length, dropping any half-written unit.
+
+        Returns False, without touching any file, if a CSV no longer matches the manifest.
+        """
+        if not self.matches(filenames):
+            return False
+        for filename in filenames:
+            file_path = os.path.join(self.output_dir, filename)
+            if not os.path.exists(file_path):
+                continue
+            committed = self.offsets.get(filename, 0)
+            if committed == 0:
+                # Nothing of this file was committed, including its header row
+                os.remove(file_path)
+                logging.info(f"Removed uncommitted {filename}")
+            elif os.path.getsize(file_path) > committed:
+                with open(file_path, 'r+b') as f:
+                    f.truncate(committed)
+                logging.info(f"Truncated {filename} to last checkpoint ({committed} bytes)")
+        return True
+
+    def is_complete(self, season: int, week: int) -> bool:
+        return (season, week) in self.completed
+
+    def commit(self, units: List[Tuple[int, int]], filenames: List[str]):
+        """Mark (season, week) units as done once their rows are durably on disk."""
+        if not units:
+            return
+
+        for filename in filenames:
+            file_path = os.path.join(self.output_dir, filename)
+            if not os.path.exists(file_path):
+                continue
+            with open(file_path, 'rb+') as f:
+                os.fsync(f.fileno())
+            self.offsets[filename] = os.path.getsize(file_path)
+            self.digests[filename] = _tail_digest(file_path, self.offsets[filename])
+
+        self.completed.update(units)
+        self._save()
+
+    def _save(self):
+        manifest = {
+            'run': self.run_key,
+            'completed': sorted(self.completed),
+            'offsets': self.offsets,
+            'digests': self.digests
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.output_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(manifest, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def clear(self):
+        """Forget all progress (a fresh, non-resumed scrape)."""
+        self.completed = set()
+        self.offsets = {}
+        self.digests = {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
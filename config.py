@@ -5,6 +5,26 @@ ESPN_FF_BASE_URL = "https://lm-api-reads.fantasy.espn.com/apis/v3/games/ffl"
 LEAGUE_ENDPOINT = "/seasons/{year}/segments/0/leagues/{league_id}"
 BOXSCORE_ENDPOINT = "/boxscore"
 
+# HTTP connection settings
+HTTP_POOL_SIZE = 10  # Keep-alive connections held per host
+HTTP_TIMEOUT = 30  # Seconds before a request is abandoned
+
+# Rate limiting and retry settings
+RATE_LIMIT_PER_SECOND = 5.0  # Sustained requests/second across all threads
+RATE_LIMIT_BURST = 10  # Requests allowed back-to-back before throttling kicks in
+RATE_LIMIT_MIN_PER_SECOND = 0.5  # Floor for the adaptive rate after repeated 429s
+HTTP_MAX_RETRIES = 5
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 60.0
+RETRY_STATUS_CODES = [429, 500, 502, 503, 504]
+
+# Response cache settings
+RESPONSE_CACHE_DIR = '.espn_cache'
+RESPONSE_CACHE_TTL = 600  # Seconds a non-final (current week, roster, settings) response stays fresh
+
+# Scrape pipeline settings
+PIPELINE_QUEUE_SIZE = 8  # Weeks buffered between fetch -> process -> write stages before upstream blocks
+
 # API parameters
 DEFAULT_SEASON = 2023
 MAX_WEEK = 17
@@ -31,3 +51,15 @@ OUTPUT_FILES = {
     'player_stats': 'player_stats.csv',
     'team_stats': 'team_stats.csv'
 }
+
+# Checkpoint manifest written to the output directory so interrupted scrapes can --resume
+CHECKPOINT_FILE = '.scrape_checkpoint.json'
+
+# Parquet dataset directory (under the output directory) used by --format parquet
+PARQUET_DIR = 'parquet'
+
+# SQLite database file (under the output directory) used by --format sqlite
+SQLITE_DB = 'league.db'
+
+# Rows buffered per CSV batch before the writer flushes (it also flushes at each season end)
+CSV_BATCH_ROWS = 50000
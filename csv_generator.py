@@ -1,12 +1,21 @@
 """Generate CSV files from processed fantasy football data."""
 import pandas as pd
-from typing import Dict
+from typing import Dict, List, Set, Tuple
 import os
 import logging
 
+from config import OUTPUT_FILES, CSV_BATCH_ROWS
+from schema import PARTITION_COLUMNS
+
 class CSVGenerator:
-    def __init__(self, output_dir: str = "."):
+    def __init__(self, output_dir: str = ".", batch_rows: int = CSV_BATCH_ROWS):
         self.output_dir = output_dir
+        self.batch_rows = batch_rows
+        self._buffer = {}
+        self._buffered_units = []
+        self._buffered_rows = 0
+        self._pending_upserts = {}
+        self._pending_upsert_units = []
         self._ensure_output_dir()
 
     def _ensure_output_dir(self):
@@ -42,3 +51,125 @@ class CSVGenerator:
         except Exception as e:
             logging.error(f"Failed to append to {filename}: {e}")
             raise
+
+    def read_persisted_units(self, filename: str) -> Set[Tuple[int, int]]:
+        """Return the (season, week) pairs already present in a CSV file."""
+        output_path = os.path.join(self.output_dir, filename)
+        if not os.path.exists(output_path):
+            return set()
+        try:
+            existing = pd.read_csv(output_path, usecols=['season', 'week'])
+        except (ValueError, pd.errors.EmptyDataError) as e:
+            logging.warning(f"Could not read persisted weeks from {filename}: {e}")
+            return set()
+        # usecols keeps the file's column order (week before season), so reorder explicitly
+        return set(existing[['season', 'week']].drop_duplicates().itertuples(index=False, name=None))
+
+    def upsert_csv(self, df: pd.DataFrame, filename: str, key_columns: List[str]):
+        """Replace rows whose key_columns match rows in df, keeping the file sorted by those keys."""
+        try:
+            output_path = os.path.join(self.output_dir, filename)
+            
+            if os.path.exists(output_path):
+                existing = pd.read_csv(output_path)
+                replaced = existing.set_index(key_columns).index.isin(df.set_index(key_columns).index)
+                combined = pd.concat([existing[~replaced], df], ignore_index=True)
+                combined = combined.sort_values(key_columns, kind='mergesort')
+            else:
+                combined = df
+            
+            # Write beside the target and rename so a crash never leaves a half-written file
+            tmp_path = f"{output_path}.tmp"
+            combined.to_csv(tmp_path, index=False)
+            os.replace(tmp_path, output_path)
+            logging.info(f"Successfully upserted {len(df)} rows into {filename}")
+        except Exception as e:
+            logging.error(f"Failed to upsert into {filename}: {e}")
+            raise
+
+    def write_unit(self, season: int, week: int, frames: Dict[str, pd.DataFrame],
+                   replace: bool = False) -> List[Tuple[int, int]]:
+        """
+        Buffer one week of every table.
+        
+        New weeks are appended in batches: when CSV_BATCH_ROWS rows are buffered, or
+        when a week from a different season arrives. With replace=True the frames are
+        held until flush() and then upserted by (season, week), so re-scraped weeks
+        overwrite their old rows.
+        
+        Returns the (season, week) units this call wrote to disk, if any.
+        """
+        if replace:
+            for table, df in frames.items():
+                self._pending_upserts.setdefault(table, []).append(df)
+            self._pending_upsert_units.append((season, week))
+            return []
+        
+        written = []
+        if self._buffered_units and self._buffered_units[-1][0] != season:
+            written = self._flush_appends()
+        
+        for table, df in frames.items():
+            self._buffer.setdefault(table, []).append(df)
+            self._buffered_rows += len(df)
+        self._buffered_units.append((season, week))
+        
+        if self._buffered_rows >= self.batch_rows:
+            written += self._flush_appends()
+        return written
+
+    def _flush_appends(self) -> List[Tuple[int, int]]:
+        """Append every buffered frame, one open handle per table."""
+        for table, frames in self._buffer.items():
+            frames = [df for df in frames if not df.empty]
+            if frames:
+                self._write_batch(pd.concat(frames, ignore_index=True), OUTPUT_FILES[table])
+        
+        # Only forget the batch once every table has it, so a failed write can be retried
+        written = self._buffered_units
+        self._buffer = {}
+        self._buffered_units = []
+        self._buffered_rows = 0
+        return written
+
+    def _write_batch(self, df: pd.DataFrame, filename: str):
+        try:
+            output_path = os.path.join(self.output_dir, filename)
+            with open(output_path, 'a', newline='') as f:
+                df.to_csv(f, header=f.tell() == 0, index=False)
+            logging.info(f"Successfully appended {len(df)} rows to {filename}")
+        except Exception as e:
+            logging.error(f"Failed to append to {filename}: {e}")
+            raise
+
+    def flush(self) -> List[Tuple[int, int]]:
+        """Write everything still buffered. Returns the (season, week) units written."""
+        written = self._flush_appends()
+        
+        for table, frames in self._pending_upserts.items():
+            if frames:
+                self.upsert_csv(pd.concat(frames, ignore_index=True), OUTPUT_FILES[table], PARTITION_COLUMNS)
+        written += self._pending_upsert_units
+        self._pending_upserts = {}
+        self._pending_upsert_units = []
+        return written
+
+    def checkpoint_files(self) -> List[str]:
+        """Files whose committed byte lengths a checkpoint should track."""
+        return list(OUTPUT_FILES.values())
+
+    def persisted_units(self) -> Set[Tuple[int, int]]:
+        """Return the (season, week) pairs present in every output CSV."""
+        units = None
+        for filename in OUTPUT_FILES.values():
+            table_units = self.read_persisted_units(filename)
+            units = table_units if units is None else units & table_units
+        return units or set()
+
+    def clear(self):
+        """Clear existing CSV files before starting a new scrape."""
+        for filename in OUTPUT_FILES.values():
+            file_path = os.path.join(self.output_dir, filename)
+            if os.path.exists(file_path):
+                os.remove(file_path)
+                logging.info(f"Cleared existing file: {filename}")
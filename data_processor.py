@@ -1,13 +1,57 @@
 """Process and transform ESPN Fantasy Football data."""
 import pandas as pd
-from typing import Dict, List, Any
+import numpy as np
+from typing import Dict, List, Any, Optional, Tuple
 import logging
 from position_mapping import POSITION_MAP, LINEUP_SLOT_MAP
+from schema import column_types, compact_frame
+
+class ColumnBuilder:
+    """
+    Accumulates rows for one output table and materializes them column by column.
+    
+    Rows are kept as plain tuples (one small allocation each, no per-row dict) and
+    transposed once into typed NumPy columns from the shared schema, so pandas never
+    has to infer types record by record. Labels become categoricals and ints are
+    narrowed (see schema.compact_frame); points stay float64 because these frames are
+    written out. The season column is left out; the scraper adds it per run.
+    """
+    def __init__(self, table: str):
+        self.types = {column: type_name for column, type_name in column_types(table).items()
+                      if column != 'season'}
+        self.rows = []
+        self.append = self.rows.append
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def to_frame(self) -> pd.DataFrame:
+        if not self.rows:
+            return compact_frame(pd.DataFrame({column: pd.Series(dtype='object' if type_name == 'string' else type_name)
+                                               for column, type_name in self.types.items()}), exact_floats=True)
+        data = {}
+        for (column, type_name), values in zip(self.types.items(), zip(*self.rows)):
+            if type_name == 'string':
+                data[column] = list(values)
+                continue
+            try:
+                data[column] = np.array(values, dtype=type_name)
+            except (TypeError, ValueError):
+                # A missing or malformed value (e.g. None): fall back to pandas inference
+                logging.warning(f"Column {column} does not fit {type_name}; inferring its type")
+                data[column] = list(values)
+        return compact_frame(pd.DataFrame(data), exact_floats=True)
+
+# Teams finishing within this weekly rank earn a top6_wins point (the top half of a 12-team league)
+TOP_N = 6
 
 class DataProcessor:
-    def __init__(self, league_data: Dict[str, Any]):
+    def __init__(self, league_data: Dict[str, Any], schedule: Optional[List[Dict[str, Any]]] = None,
+                 top_n: int = TOP_N):
         self.league_data = league_data
+        self.top_n = top_n
         self.teams_map = self._create_teams_map()
+        self.schedule_by_week = self._index_schedule(schedule) if schedule is not None else None
 
     def _create_teams_map(self) -> Dict[int, str]:
         """Create a mapping of team IDs to team names."""
@@ -26,49 +70,59 @@ class DataProcessor:
             logging.error(f"Error creating teams map: {e}")
         return teams_map
 
+    def _index_schedule(self, schedule: List[Dict[str, Any]]) -> Dict[int, List[Dict[str, Any]]]:
+        """Group a season schedule by matchupPeriodId, dropping duplicate matchup IDs."""
+        schedule_by_week = {}
+        seen_ids = set()
+        for matchup in schedule:
+            matchup_id = matchup.get('id')
+            if matchup_id is not None:
+                if matchup_id in seen_ids:
+                    continue
+                seen_ids.add(matchup_id)
+            schedule_by_week.setdefault(matchup.get('matchupPeriodId'), []).append(matchup)
+        return schedule_by_week
+
+    def week_schedule(self, week: int, boxscore_data: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Return the matchups played in a given week.
+        
+        Uses the season schedule supplied at construction when available; otherwise
+        slices the schedule embedded in boxscore_data.
+        """
+        if self.schedule_by_week is not None:
+            return self.schedule_by_week.get(week, [])
+        if not boxscore_data:
+            return []
+        return self._index_schedule(boxscore_data.get('schedule', [])).get(week, [])
+
     def process_matchups(self, boxscore_data: Dict[str, Any], week: int) -> pd.DataFrame:
-        """Process matchup data into a DataFrame."""
-        matchups = []
+        """Process matchup data into a DataFrame (two rows per game, one from each side)."""
+        matchups = ColumnBuilder('matchups')
         
         try:
-            for matchup in boxscore_data.get('schedule', []):
+            for matchup in self.week_schedule(week, boxscore_data):
+                matchup_id = matchup['id']
                 home_team_id = matchup['home']['teamId']
                 away_team_id = matchup['away']['teamId']
                 home_score = matchup['home']['totalPoints']
                 away_score = matchup['away']['totalPoints']
+                home_name = self.teams_map.get(home_team_id, f'Team {home_team_id}')
+                away_name = self.teams_map.get(away_team_id, f'Team {away_team_id}')
                 
-                matchups.extend([
-                    {
-                        'week': week,
-                        'matchup_id': matchup['id'],
-                        'team_id': home_team_id,
-                        'team_name': self.teams_map.get(home_team_id, f'Team {home_team_id}'),
-                        'opponent_id': away_team_id,
-                        'opponent_name': self.teams_map.get(away_team_id, f'Team {away_team_id}'),
-                        'team_score': home_score,
-                        'opponent_score': away_score,
-                        'winner': home_score > away_score
-                    },
-                    {
-                        'week': week,
-                        'matchup_id': matchup['id'],
-                        'team_id': away_team_id,
-                        'team_name': self.teams_map.get(away_team_id, f'Team {away_team_id}'),
-                        'opponent_id': home_team_id,
-                        'opponent_name': self.teams_map.get(home_team_id, f'Team {home_team_id}'),
-                        'team_score': away_score,
-                        'opponent_score': home_score,
-                        'winner': away_score > home_score
-                    }
-                ])
+                matchups.append((week, matchup_id, home_team_id, home_name, away_team_id, away_name,
+                                 home_score, away_score, home_score > away_score))
+                matchups.append((week, matchup_id, away_team_id, away_name, home_team_id, home_name,
+                                 away_score, home_score, away_score > home_score))
         except KeyError as e:
             logging.error(f"Error processing matchups: {e}")
             
-        return pd.DataFrame(matchups)
+        return matchups.to_frame()
 
     def process_player_stats(self, boxscore_data: Dict[str, Any], week: int) -> pd.DataFrame:
         """Process player statistics into a DataFrame."""
-        player_stats = []
+        player_stats = ColumnBuilder('player_stats')
+        append = player_stats.append
         
         try:
             for team in boxscore_data.get('teams', []):
@@ -76,80 +130,102 @@ class DataProcessor:
                 team_name = self.teams_map.get(team_id, f'Team {team_id}')
                 
                 for player in team.get('roster', {}).get('entries', []):
-                    position_id = player['playerPoolEntry']['player']['defaultPositionId']
+                    pool_entry = player['playerPoolEntry']
+                    info = pool_entry['player']
+                    position_id = info['defaultPositionId']
                     slot_id = player['lineupSlotId']
                     
-                    player_stats.append({
-                        'week': week,
-                        'team_id': team_id,
-                        'team_name': team_name,
-                        'player_id': player['playerId'],
-                        'player_name': player['playerPoolEntry']['player']['fullName'],
-                        'position': POSITION_MAP.get(position_id, f'POS_{position_id}'),
-                        'slot_position': LINEUP_SLOT_MAP.get(slot_id, f'SLOT_{slot_id}'),
-                        'points': player['playerPoolEntry']['appliedStatTotal'],
-                        'projected_points': player['playerPoolEntry'].get('projectedPointTotal', 0)
-                    })
+                    append((week, team_id, team_name, player['playerId'], info['fullName'],
+                            POSITION_MAP.get(position_id, f'POS_{position_id}'),
+                            LINEUP_SLOT_MAP.get(slot_id, f'SLOT_{slot_id}'),
+                            pool_entry['appliedStatTotal'], pool_entry.get('projectedPointTotal', 0)))
         except KeyError as e:
             logging.error(f"Error processing player stats: {e}")
             
-        return pd.DataFrame(player_stats)
+        return player_stats.to_frame()
 
     def process_team_stats(self, boxscore_data: Dict[str, Any], week: int) -> pd.DataFrame:
         """Process team statistics into a DataFrame."""
-        team_stats = []
-        
+        return self._team_stats_frame([(week, matchup) for matchup in self.week_schedule(week, boxscore_data)])
+
+    def _team_stats_frame(self, week_matchups: List[Tuple[int, Dict[str, Any]]]) -> pd.DataFrame:
+        """Flatten (week, matchup) pairs into one row per team and week, then rank them with weekly_team_stats."""
+        sides = {}
         try:
-            # Build team stats from matchup schedule data
-            team_points = {}
-            team_points_against = {}
-            
-            for matchup in boxscore_data.get('schedule', []):
-                if matchup.get('matchupPeriodId') == week:
-                    home_id = matchup.get('home', {}).get('teamId')
-                    away_id = matchup.get('away', {}).get('teamId')
-                    home_points = matchup.get('home', {}).get('totalPoints', 0)
-                    away_points = matchup.get('away', {}).get('totalPoints', 0)
-                    
-                    if home_id and away_id:
-                        team_points[home_id] = home_points
-                        team_points[away_id] = away_points
-                        team_points_against[home_id] = away_points
-                        team_points_against[away_id] = home_points
-            
-            # Sort teams by points
-            sorted_teams = sorted(team_points.items(), key=lambda x: x[1], reverse=True)
-            
-            # Calculate stats for each team
-            total_teams = len(team_points)
-            
-            for rank, (team_id, points) in enumerate(sorted_teams, 1):
-                points_against = team_points_against.get(team_id, 0)
-                
-                # Wins: 1 if won matchup, 0 if lost
-                wins = 1 if points > points_against else 0
-                
-                # Top6Wins: 1 if in top 6 scorers, 0 otherwise
-                top6_wins = 1 if rank <= 6 else 0
+            for week, matchup in week_matchups:
+                home_id = matchup.get('home', {}).get('teamId')
+                away_id = matchup.get('away', {}).get('teamId')
+                home_points = matchup.get('home', {}).get('totalPoints', 0)
+                away_points = matchup.get('away', {}).get('totalPoints', 0)
                 
-                # mvp_w: all-play winning percentage
-                # Count how many teams this team would have beaten
-                teams_beaten = sum(1 for other_points in team_points.values() if points > other_points)
-                # Divide by number of other teams (total - 1)
-                mvp_w = teams_beaten / (total_teams - 1) if total_teams > 1 else 0
-                
-                team_stats.append({
-                    'week': week,
-                    'team_id': team_id,
-                    'team_name': self.teams_map.get(team_id, f"Team {team_id}"),
-                    'points_for': points,
-                    'points_against': points_against,
-                    'weekly_rank': rank,
-                    'wins': wins,
-                    'top6_wins': top6_wins,
-                    'mvp_w': round(mvp_w, 4)
-                })
+                if home_id and away_id:
+                    sides[(week, home_id)] = (home_points, away_points)
+                    sides[(week, away_id)] = (away_points, home_points)
         except (KeyError, TypeError) as e:
             logging.error(f"Error processing team stats: {e}")
-            
-        return pd.DataFrame(team_stats)
+            sides = {}
+        
+        weeks = np.fromiter((week for week, _ in sides), dtype=np.int64, count=len(sides))
+        team_ids = np.fromiter((team_id for _, team_id in sides), dtype=np.int64, count=len(sides))
+        points = np.array(list(sides.values()), dtype=np.float64).reshape(-1, 2)
+        
+        stats = weekly_team_stats(weeks, team_ids, points[:, 0], points[:, 1], self.top_n)
+        stats.insert(2, 'team_name', [self.teams_map.get(team_id, f"Team {team_id}") for team_id in stats['team_id']])
+        return compact_frame(stats, exact_floats=True)
+
+def weekly_team_stats(weeks: np.ndarray, team_ids: np.ndarray, points_for: np.ndarray,
+                      points_against: np.ndarray, top_n: int = TOP_N) -> pd.DataFrame:
+    """
+    Rank teams within each week, for any number of weeks at once.
+    
+    One lexsort by (week, points descending) replaces the per-team scans, so the cost
+    is O(n log n) in rows instead of O(teams^2) per week. Rows come back ordered by
+    week, then rank; teams with equal scores keep their input order.
+    
+    Ties are handled consistently:
+      - weekly_rank: tied teams share the best rank (1, 2, 2, 4)
+      - top6_wins: 1 for every team whose rank is within top_n, so a tie at the
+        cutoff credits all tied teams
+      - mvp_w: all-play percentage, counting a tie with another team as half a win
+      - wins: 1 only for outscoring the opponent (a tied matchup is not a win)
+    """
+    weeks = np.asarray(weeks)
+    points_for = np.asarray(points_for, dtype=np.float64)
+    points_against = np.asarray(points_against, dtype=np.float64)
+    n = len(weeks)
+    positions = np.arange(n)
+    
+    order = np.lexsort((positions, -points_for, weeks))
+    sorted_weeks = weeks[order]
+    sorted_points = points_for[order]
+    
+    # Boundaries of each week and of each run of equal scores within a week
+    new_week = np.ones(n, dtype=bool)
+    new_week[1:] = sorted_weeks[1:] != sorted_weeks[:-1]
+    new_score = new_week.copy()
+    new_score[1:] |= sorted_points[1:] != sorted_points[:-1]
+    last_in_score = np.ones(n, dtype=bool)
+    last_in_score[:-1] = new_score[1:]
+    
+    week_start = np.maximum.accumulate(np.where(new_week, positions, 0))
+    score_start = np.maximum.accumulate(np.where(new_score, positions, 0))
+    score_end = np.minimum.accumulate(np.where(last_in_score, positions, n)[::-1])[::-1] + 1
+    week_index = np.cumsum(new_week) - 1
+    week_size = np.bincount(week_index)[week_index]
+    
+    rank = score_start - week_start + 1
+    tied_with = score_end - score_start - 1
+    beaten = week_size - (score_end - week_start)
+    opponents = week_size - 1
+    mvp_w = np.divide(beaten + 0.5 * tied_with, opponents, out=np.zeros(n), where=opponents > 0)
+    
+    return pd.DataFrame({
+        'week': sorted_weeks,
+        'team_id': np.asarray(team_ids)[order],
+        'points_for': sorted_points,
+        'points_against': points_against[order],
+        'weekly_rank': rank,
+        'wins': (sorted_points > points_against[order]).astype(np.int64),
+        'top6_wins': (rank <= top_n).astype(np.int64),
+        'mvp_w': np.round(mvp_w, 4)
+    })
@@ -1,11 +1,20 @@
 """ESPN Fantasy Football API interaction module with enhanced roster health tracking and lineup optimization."""
 import requests
-from typing import Dict, Any, Optional, List
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, Optional, List, Callable
 import logging
+import os
 import re
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 
+from config import (ESPN_FF_BASE_URL, LEAGUE_ENDPOINT, HTTP_POOL_SIZE, HTTP_TIMEOUT,
+                    HTTP_MAX_RETRIES, RETRY_STATUS_CODES)
+from rate_limiter import RateLimiter, backoff_delay, parse_retry_after
+from json_codec import loads as json_loads
+from response_cache import ResponseCache, request_identity, request_key
+
 POSITION_MAP = {
     0: 'QB', 1: 'QB', 2: 'RB', 3: 'RB', 4: 'WR', 5: 'WR', 
     6: 'TE', 7: 'OP', 16: 'D/ST', 17: 'K', 20: 'Bench', 21: 'IR', 23: 'Flex'
@@ -36,6 +45,9 @@ BYE_WEEKS_2025 = {
 
 FLEX_ELIGIBLE = ['RB', 'WR', 'TE']
 
+# x-fantasy-filter for the kona_player_info view: top 300 rostered players with per-period stats
+DETAILED_ROSTER_FILTER = '{"players":{"filterSlotIds":{"value":[0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,23,24]},"filterStatsForCurrentSeasonScoringPeriodId":{"value":[1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18]},"sortAppliedStatTotalForScoringPeriodId":{"sortAsc":false,"sortPriority":1,"value":0},"limit":300}}'
+
 # Starter slot IDs (excludes Bench=20, IR=21)
 STARTER_SLOTS = {0, 2, 4, 6, 16, 17, 23}  # QB, RB, WR, TE, D/ST, K, Flex
 BENCH_SLOTS = {20, 21}  # Bench, IR
@@ -67,14 +79,91 @@ class LineupOptimization:
     projected_gain: float
     confidence: float
     
+def create_session(pool_size: int = HTTP_POOL_SIZE) -> requests.Session:
+    """
+    Create a keep-alive HTTP session with a connection pool sized for concurrent use.
+    
+    A single session can be shared by several ESPNFantasyAPI instances (e.g. one per
+    season) so every request reuses the same TCP+TLS connections and cookie jar.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Connection': 'keep-alive'})
+    return session
+
+@dataclass
+class RosterSnapshot:
+    """
+    One mMatchupScore+mRoster+mTeam response for a scoring period, indexed once.
+    
+    Weekly projections, roster health and the lineup optimizer all read the same
+    snapshot instead of each downloading and walking the rosters again.
+    """
+    week: int
+    teams_map: Dict[int, str] = field(default_factory=dict)
+    team_entries: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    matchup_entries: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    
+    @classmethod
+    def from_response(cls, data: Dict[str, Any], week: int) -> 'RosterSnapshot':
+        """Index roster entries by team abbrev, from both the team rosters and this week's matchups."""
+        snapshot = cls(week=week)
+        
+        for team in data.get('teams', []):
+            team_abbrev = team.get('abbrev', f'Team{team["id"]}')
+            snapshot.teams_map[team['id']] = team_abbrev
+            snapshot.team_entries[team_abbrev] = team.get('roster', {}).get('entries', [])
+        
+        for matchup in data.get('schedule', []):
+            if matchup.get('matchupPeriodId') != week:
+                continue
+            
+            for side in ['home', 'away']:
+                team_data = matchup.get(side, {})
+                if not team_data:
+                    continue
+                
+                team_id = team_data.get('teamId')
+                if team_id not in snapshot.teams_map:
+                    continue
+                
+                roster_for_current = team_data.get('rosterForCurrentScoringPeriod', {})
+                snapshot.matchup_entries[snapshot.teams_map[team_id]] = roster_for_current.get('entries', [])
+        
+        return snapshot
+
 class ESPNFantasyAPI:
-    def __init__(self, league_id: int, season: int, espn_s2: Optional[str] = None, swid: Optional[str] = None):
+    def __init__(self, league_id: int, season: int, espn_s2: Optional[str] = None, swid: Optional[str] = None,
+                 session: Optional[requests.Session] = None, pool_size: int = HTTP_POOL_SIZE,
+                 timeout: float = HTTP_TIMEOUT, cache: Optional[ResponseCache] = None,
+                 rate_limiter: Optional[RateLimiter] = None, max_retries: int = HTTP_MAX_RETRIES,
+                 base_url: Optional[str] = None, record_dir: Optional[str] = None,
+                 decoder: Callable[[bytes], Any] = json_loads):
         self.league_id = league_id
         self.season = season
-        self.base_url = "https://lm-api-reads.fantasy.espn.com/apis/v3/games/ffl"
+        # ESPN_FF_BASE_URL in the environment points the client at a local stand-in (espn_stub_server)
+        self.base_url = (base_url or os.environ.get('ESPN_FF_BASE_URL') or ESPN_FF_BASE_URL).rstrip('/')
+        self.league_url = self.base_url + LEAGUE_ENDPOINT.format(year=season, league_id=league_id)
         self.espn_s2 = espn_s2
         self.swid = swid
         self.stud_threshold = 12.0
+        self.timeout = timeout
+        self.session = session or create_session(pool_size)
+        self.cache = cache
+        self.rate_limiter = rate_limiter or RateLimiter()
+        # Record mode: every response body is saved under its request key for later replay
+        record_dir = record_dir or os.environ.get('ESPN_RECORD_DIR')
+        self.recorder = ResponseCache(record_dir, track_stats=False) if record_dir else None
+        self.max_retries = max_retries
+        self.current_scoring_period = None
+        self.season_complete = False
+        self.decoder = decoder
+        
+        cookies = self._get_cookies()
+        if cookies:
+            self.session.cookies.update(cookies)
         
     def _get_cookies(self) -> Optional[Dict[str, str]]:
         """Build cookies dict for private league authentication."""
@@ -92,6 +181,107 @@ class ESPNFantasyAPI:
             'Accept': 'application/json'
         }
     
+    def _get(self, params: Optional[Dict[str, Any]] = None,
+             extra_headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """
+        Issue a GET against the league endpoint over the pooled session.
+        
+        Every attempt waits on the shared rate limiter. Throttling and server errors
+        (RETRY_STATUS_CODES) and dropped connections are retried with exponential
+        backoff and jitter, honoring Retry-After when ESPN sends one.
+        """
+        headers = self._get_headers()
+        if extra_headers:
+            headers.update(extra_headers)
+        
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.get(self.league_url, params=params, headers=headers, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = backoff_delay(attempt)
+                logging.warning(f"Request failed ({e}); retrying in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+            
+            if response.status_code in RETRY_STATUS_CODES and attempt < self.max_retries:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                delay = retry_after if retry_after is not None else backoff_delay(attempt)
+                if response.status_code in (429, 503):
+                    self.rate_limiter.penalize()
+                    self.rate_limiter.pause(delay)
+                logging.warning(f"ESPN returned {response.status_code}; retrying in {delay:.1f}s "
+                                f"(attempt {attempt + 1}/{self.max_retries})")
+                response.close()
+                time.sleep(delay)
+                continue
+            
+            response.raise_for_status()
+            self.rate_limiter.reward()
+            return response
+    
+    def is_week_final(self, week: int) -> bool:
+        """
+        A scoring period is final once the league has moved past it; its data never changes again.
+        
+        Requires get_league_data() to have been called; unknown periods are treated as not final.
+        """
+        if self.current_scoring_period is None:
+            return False
+        return int(week) < self.current_scoring_period
+    
+    def _is_final_period(self, params: Optional[Dict[str, Any]]) -> bool:
+        """
+        Whether a request's response can never change: everything in a completed season,
+        otherwise requests for a final scoring period (requests without one never are).
+        """
+        if self.season_complete:
+            return True
+        week = (params or {}).get('scoringPeriodId')
+        return week is not None and self.is_week_final(week)
+    
+    def _fetch(self, params: Optional[Dict[str, Any]] = None,
+               extra_headers: Optional[Dict[str, str]] = None) -> bytes:
+        """Return the raw response body for a league request, served from the response cache when possible."""
+        if self.cache is None and self.recorder is None:
+            return self._get(params, extra_headers).content
+        
+        fantasy_filter = (extra_headers or {}).get('x-fantasy-filter')
+        key = request_key(self.league_id, self.season, params, fantasy_filter)
+        identity = request_identity(self.league_id, self.season, params, fantasy_filter)
+        
+        body = self.cache.get(key) if self.cache is not None else None
+        if body is None:
+            body = self._get(params, extra_headers).content
+            if self.cache is not None:
+                self.cache.put(key, body, final=self._is_final_period(params), identity=identity)
+        
+        if self.recorder is not None:
+            self.recorder.put(key, body, final=True, identity=identity)
+        return body
+    
+    def _fetch_json(self, params: Optional[Dict[str, Any]] = None,
+                    extra_headers: Optional[Dict[str, str]] = None) -> Any:
+        """
+        Fetch and decode a league request with the configured decoder.
+        
+        A body that isn't JSON (e.g. an HTML error page served with a 200) is dropped from
+        the cache and recordings and raised as requests' JSONDecodeError, so callers'
+        RequestException handlers log and skip it like any other failed request.
+        """
+        body = self._fetch(params, extra_headers)
+        try:
+            return self.decoder(body)
+        except ValueError as e:
+            key = request_key(self.league_id, self.season, params, (extra_headers or {}).get('x-fantasy-filter'))
+            for store in (self.cache, self.recorder):
+                if store is not None:
+                    store.discard(key)
+            raise requests.exceptions.JSONDecodeError(getattr(e, 'msg', str(e)), getattr(e, 'doc', ''),
+                                                      getattr(e, 'pos', 0)) from e
+    
     def _parse_injury_status(self, status: str, injury_detail: str = '') -> tuple:
         """
         Parse injury status and estimate availability probability.
@@ -149,19 +339,29 @@ class ESPNFantasyAPI:
         
     def get_league_data(self) -> Optional[Dict[str, Any]]:
         """Fetch league data from ESPN API."""
-        response = None
         try:
-            url = f"{self.base_url}/seasons/{self.season}/segments/0/leagues/{self.league_id}"
-            cookies = self._get_cookies()
-            response = requests.get(url, cookies=cookies, headers=self._get_headers())
-            response.raise_for_status()
-            return response.json()
+            data = self._fetch_json()
+            self._record_scoring_period(data)
+            if self.season_complete and self.cache is not None:
+                # Fetched before the season was known to be over; it won't change either
+                self.cache.mark_final(request_key(self.league_id, self.season))
+            return data
         except requests.exceptions.RequestException as e:
             logging.error(f"Failed to fetch league data: {e}")
-            if response:
-                logging.error(f"Response status: {response.status_code}")
+            if e.response is not None:
+                logging.error(f"Response status: {e.response.status_code}")
             return None
 
+    def _record_scoring_period(self, league_data: Dict[str, Any]):
+        """Remember the league's current scoring period so earlier periods can be cached permanently."""
+        status = league_data.get('status', {})
+        if status.get('isActive') is False and status.get('finalScoringPeriod'):
+            # Completed season: every scoring period is final
+            self.current_scoring_period = status['finalScoringPeriod'] + 1
+            self.season_complete = True
+        elif league_data.get('scoringPeriodId'):
+            self.current_scoring_period = league_data['scoringPeriodId']
+    
     def get_boxscore(self, week: int) -> Optional[Dict[str, Any]]:
         """Fetch boxscore data for a specific week."""
         try:
@@ -169,15 +369,37 @@ class ESPNFantasyAPI:
                 'scoringPeriodId': week,
                 'view': 'mMatchup'
             }
-            url = f"{self.base_url}/seasons/{self.season}/segments/0/leagues/{self.league_id}"
-            cookies = self._get_cookies()
-            response = requests.get(url, params=params, cookies=cookies, headers=self._get_headers())
-            response.raise_for_status()
-            return response.json()
+            return self._fetch_json(params)
         except requests.exceptions.RequestException as e:
             logging.error(f"Failed to fetch boxscore for week {week}: {e}")
             return None
 
+    def get_season_schedule(self) -> Optional[Dict[str, Any]]:
+        """
+        Fetch the full season schedule with scores in a single request.
+        
+        Every matchup period is included, so callers slice it by matchupPeriodId
+        instead of downloading the schedule again for each week.
+        """
+        try:
+            params = {'view': 'mMatchupScore'}
+            return self._fetch_json(params)
+        except requests.exceptions.RequestException as e:
+            logging.error(f"Failed to fetch season schedule: {e}")
+            return None
+    
+    def get_week_rosters(self, week: int) -> Optional[Dict[str, Any]]:
+        """Fetch every team's roster with player points for a specific week (no schedule payload)."""
+        try:
+            params = {
+                'scoringPeriodId': week,
+                'view': 'mRoster'
+            }
+            return self._fetch_json(params)
+        except requests.exceptions.RequestException as e:
+            logging.error(f"Failed to fetch rosters for week {week}: {e}")
+            return None
+    
     def get_projections_and_rosters(self, week: int) -> Optional[Dict[str, Any]]:
         """Fetch projections and roster data for a specific week."""
         try:
@@ -185,38 +407,46 @@ class ESPNFantasyAPI:
                 'scoringPeriodId': week,
                 'view': ['mMatchupScore', 'mRoster', 'mTeam']
             }
-            url = f"{self.base_url}/seasons/{self.season}/segments/0/leagues/{self.league_id}"
-            cookies = self._get_cookies()
-            response = requests.get(url, params=params, cookies=cookies, headers=self._get_headers())
-            response.raise_for_status()
-            return response.json()
+            return self._fetch_json(params)
         except requests.exceptions.RequestException as e:
             logging.error(f"Failed to fetch projections for week {week}: {e}")
             return None
     
+    def get_schedule_and_settings(self) -> Optional[Dict[str, Any]]:
+        """Fetch the season schedule with team info and league schedule settings."""
+        try:
+            params = {'view': ['mTeam', 'mMatchupScore', 'mSettings']}
+            return self._fetch_json(params)
+        except requests.exceptions.RequestException as e:
+            logging.error(f"Failed to fetch schedule and settings: {e}")
+            return None
+    
+    def get_roster_snapshot(self, week: int) -> Optional[RosterSnapshot]:
+        """Fetch one combined matchup/roster/team response for a week and index it for reuse."""
+        data = self.get_projections_and_rosters(week)
+        if not data:
+            return None
+        return RosterSnapshot.from_response(data, week)
+    
     def get_detailed_rosters(self) -> Optional[Dict[str, Any]]:
         """Fetch detailed roster data including player news and projections."""
         try:
             params = {
                 'view': ['mRoster', 'mTeam', 'kona_player_info']
             }
-            url = f"{self.base_url}/seasons/{self.season}/segments/0/leagues/{self.league_id}"
-            cookies = self._get_cookies()
-            
-            headers = self._get_headers()
-            headers['x-fantasy-filter'] = '{"players":{"filterSlotIds":{"value":[0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,23,24]},"filterStatsForCurrentSeasonScoringPeriodId":{"value":[1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18]},"sortAppliedStatTotalForScoringPeriodId":{"sortAsc":false,"sortPriority":1,"value":0},"limit":300}}'
-            
-            response = requests.get(url, params=params, cookies=cookies, headers=headers)
-            response.raise_for_status()
-            return response.json()
+            return self._fetch_json(params, {'x-fantasy-filter': DETAILED_ROSTER_FILTER})
         except requests.exceptions.RequestException as e:
             logging.error(f"Failed to fetch detailed rosters: {e}")
             return None
     
-    def get_weekly_projections(self, weeks: List[int]) -> Dict[int, Dict[str, Dict[str, Any]]]:
+    def get_weekly_projections(self, weeks: List[int],
+                               snapshots: Optional[Dict[int, RosterSnapshot]] = None) -> Dict[int, Dict[str, Dict[str, Any]]]:
         """
         Fetch ESPN projected points and roster health for multiple weeks.
         
+        Weeks present in `snapshots` are computed from the already-fetched snapshot;
+        any others are fetched here.
+        
         Returns:
             Dict mapping week -> team_abbrev -> {
                 'projected_points': float,
@@ -229,67 +459,50 @@ class ESPNFantasyAPI:
         
         for week in weeks:
             try:
-                data = self.get_projections_and_rosters(week)
-                if not data:
+                snapshot = snapshots.get(week) if snapshots else None
+                if snapshot is None:
+                    snapshot = self.get_roster_snapshot(week)
+                if snapshot is None:
                     continue
                 
-                teams_map = {t['id']: t.get('abbrev', f'Team{t["id"]}') for t in data.get('teams', [])}
                 week_projections = {}
                 
-                schedule = data.get('schedule', [])
-                for matchup in schedule:
-                    if matchup.get('matchupPeriodId') != week:
-                        continue
+                for team_abbrev, entries in snapshot.matchup_entries.items():
+                    projected_pts = 0
+                    injury_count = 0
+                    healthy_starters = 0
+                    total_starters = 0
                     
-                    for side in ['home', 'away']:
-                        team_data = matchup.get(side, {})
-                        if not team_data:
-                            continue
-                        
-                        team_id = team_data.get('teamId')
-                        if team_id not in teams_map:
+                    for entry in entries:
+                        slot_id = entry.get('lineupSlotId', 20)
+                        if slot_id not in STARTER_SLOTS:
                             continue
                         
-                        team_abbrev = teams_map[team_id]
-                        
-                        projected_pts = 0
-                        injury_count = 0
-                        healthy_starters = 0
-                        total_starters = 0
-                        
-                        roster_for_current = team_data.get('rosterForCurrentScoringPeriod', {})
-                        entries = roster_for_current.get('entries', [])
+                        total_starters += 1
+                        player_pool = entry.get('playerPoolEntry', {})
+                        player = player_pool.get('player', {})
                         
-                        for entry in entries:
-                            slot_id = entry.get('lineupSlotId', 20)
-                            if slot_id not in STARTER_SLOTS:
-                                continue
-                            
-                            total_starters += 1
-                            player_pool = entry.get('playerPoolEntry', {})
-                            player = player_pool.get('player', {})
-                            
-                            injury_status = player.get('injuryStatus', 'ACTIVE')
-                            if injury_status in ['OUT', 'IR', 'INJURY_RESERVE', 'DOUBTFUL', 'SUSPENSION']:
-                                injury_count += 1
-                            else:
-                                healthy_starters += 1
-                            
-                            stats = player.get('stats', [])
-                            for stat in stats:
-                                if stat.get('statSourceId') == 1 and stat.get('scoringPeriodId') == week:
-                                    projected_pts += stat.get('appliedTotal', 0)
-                                    break
-                        
-                        roster_strength = healthy_starters / max(total_starters, 1)
+                        injury_status = player.get('injuryStatus', 'ACTIVE')
+                        if injury_status in ['OUT', 'IR', 'INJURY_RESERVE', 'DOUBTFUL', 'SUSPENSION']:
+                            injury_count += 1
+                        else:
+                            healthy_starters += 1
                         
-                        week_projections[team_abbrev] = {
-                            'projected_points': round(projected_pts, 2),
-                            'injury_count': injury_count,
-                            'healthy_starters': healthy_starters,
-                            'total_starters': total_starters,
-                            'roster_strength': round(roster_strength, 3)
-                        }
+                        stats = player.get('stats', [])
+                        for stat in stats:
+                            if stat.get('statSourceId') == 1 and stat.get('scoringPeriodId') == week:
+                                projected_pts += stat.get('appliedTotal', 0)
+                                break
+                    
+                    roster_strength = healthy_starters / max(total_starters, 1)
+                    
+                    week_projections[team_abbrev] = {
+                        'projected_points': round(projected_pts, 2),
+                        'injury_count': injury_count,
+                        'healthy_starters': healthy_starters,
+                        'total_starters': total_starters,
+                        'roster_strength': round(roster_strength, 3)
+                    }
                 
                 all_projections[week] = week_projections
                 
@@ -299,10 +512,13 @@ class ESPNFantasyAPI:
         
         return all_projections
     
-    def get_enhanced_roster_health(self, current_week: int) -> Dict[str, Dict[str, Any]]:
+    def get_enhanced_roster_health(self, current_week: int,
+                                   snapshot: Optional[RosterSnapshot] = None) -> Dict[str, Dict[str, Any]]:
         """
         Get comprehensive roster health including bench studs and return outlooks.
         
+        Uses the given snapshot of the current week, or fetches one.
+        
         Returns:
             Dict mapping team_abbrev -> {
                 'roster_health_pct': float,
@@ -316,20 +532,14 @@ class ESPNFantasyAPI:
             }
         """
         try:
-            params = {'view': ['mRoster', 'mTeam']}
-            url = f"{self.base_url}/seasons/{self.season}/segments/0/leagues/{self.league_id}"
-            cookies = self._get_cookies()
-            response = requests.get(url, params=params, cookies=cookies, headers=self._get_headers())
-            response.raise_for_status()
-            data = response.json()
+            if snapshot is None:
+                snapshot = self.get_roster_snapshot(current_week)
+            if snapshot is None:
+                return {}
             
             roster_health = {}
             
-            for team in data.get('teams', []):
-                team_abbrev = team.get('abbrev', f'Team{team["id"]}')
-                roster = team.get('roster', {})
-                entries = roster.get('entries', [])
-                
+            for team_abbrev, entries in snapshot.team_entries.items():
                 starters = []
                 bench_players = []
                 injured_starters = []
@@ -525,11 +735,7 @@ class ESPNFantasyAPI:
         """
         try:
             params = {'view': ['mRoster', 'mTeam']}
-            url = f"{self.base_url}/seasons/{self.season}/segments/0/leagues/{self.league_id}"
-            cookies = self._get_cookies()
-            response = requests.get(url, params=params, cookies=cookies, headers=self._get_headers())
-            response.raise_for_status()
-            data = response.json()
+            data = self._fetch_json(params)
             
             roster_health = {}
             
@@ -589,10 +795,13 @@ class ESPNFantasyAPI:
             return True
         return False
     
-    def get_optimized_lineup_projections(self, week: int) -> Dict[str, Dict[str, Any]]:
+    def get_optimized_lineup_projections(self, week: int,
+                                         snapshot: Optional[RosterSnapshot] = None) -> Dict[str, Dict[str, Any]]:
         """
         Analyze each team's roster and calculate optimized lineup projections.
         
+        Uses the given snapshot of `week`, or fetches one.
+        
         Considers:
         - Injured starters who should be benched
         - BYE week players who need substitutes
@@ -613,20 +822,14 @@ class ESPNFantasyAPI:
             }
         """
         try:
-            params = {'scoringPeriodId': week, 'view': ['mRoster', 'mTeam']}
-            url = f"{self.base_url}/seasons/{self.season}/segments/0/leagues/{self.league_id}"
-            cookies = self._get_cookies()
-            response = requests.get(url, params=params, cookies=cookies, headers=self._get_headers())
-            response.raise_for_status()
-            data = response.json()
+            if snapshot is None:
+                snapshot = self.get_roster_snapshot(week)
+            if snapshot is None:
+                return {}
             
             optimized_lineups = {}
             
-            for team in data.get('teams', []):
-                team_abbrev = team.get('abbrev', f'Team{team["id"]}')
-                roster = team.get('roster', {})
-                entries = roster.get('entries', [])
-                
+            for team_abbrev, entries in snapshot.team_entries.items():
                 starters = []
                 bench_players = []
                 bye_starters = []
@@ -860,17 +1063,8 @@ class ESPNFantasyAPI:
                 - pf_prize: Points-For prize (50% of total FAAB spent)
         """
         try:
-            url = f"{self.base_url}/seasons/{self.season}/segments/0/leagues/{self.league_id}"
             params = {'view': 'mTeam'}
-            
-            response = requests.get(
-                url,
-                cookies=self._get_cookies(),
-                headers=self._get_headers(),
-                params=params
-            )
-            response.raise_for_status()
-            data = response.json()
+            data = self._fetch_json(params)
             
             team_spending = {}
             total_spent = 0
@@ -895,10 +1089,10 @@ class ESPNFantasyAPI:
                 'pf_prize': 0
             }
 
-    def validate_league(self) -> bool:
-        """Validate if the league ID exists and is accessible."""
+    def validate_league(self) -> Optional[Dict[str, Any]]:
+        """Return the league data if the league ID exists and is accessible (else None), so it isn't fetched twice."""
         try:
             league_data = self.get_league_data()
-            return league_data is not None and 'id' in league_data
+            return league_data if league_data is not None and 'id' in league_data else None
         except Exception:
-            return False
+            return None
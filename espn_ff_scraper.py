@@ -4,12 +4,17 @@ import logging
 from datetime import datetime
 import sys
 import os
-from typing import Optional
-
-from espn_api import ESPNFantasyAPI
+from espn_api import ESPNFantasyAPI, create_session
 from data_processor import DataProcessor
 from csv_generator import CSVGenerator
-from config import DEFAULT_SEASON, MAX_WEEK, OUTPUT_FILES
+from parquet_store import MISSING_PYARROW, ParquetStore
+from league_store import LeagueStore
+from checkpoint import CheckpointManifest
+from pipeline import Pipeline
+from rate_limiter import RateLimiter
+from response_cache import ResponseCache
+from config import (DEFAULT_SEASON, MAX_WEEK, HTTP_POOL_SIZE, RESPONSE_CACHE_DIR,
+                    RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST, PIPELINE_QUEUE_SIZE)
 
 def setup_logging():
     """Configure logging settings."""
@@ -21,8 +26,8 @@ def setup_logging():
         ]
     )
 
-def parse_arguments():
-    """Parse command line arguments."""
+def parse_arguments(argv=None):
+    """Parse command line arguments (sys.argv unless argv is given)."""
     parser = argparse.ArgumentParser(description='ESPN Fantasy Football Data Scraper')
     parser.add_argument('--league_id', type=int, required=True,
                       help='ESPN Fantasy Football League ID')
@@ -32,7 +37,30 @@ def parse_arguments():
                       help=f'Specific week to scrape (default: all weeks)')
     parser.add_argument('--output', type=str, default='.',
                       help='Output directory for CSV files')
-    return parser.parse_args()
+    parser.add_argument('--format', choices=['csv', 'parquet', 'sqlite'], default='csv',
+                      help='Output format: CSV files, a season/week-partitioned Parquet dataset, '
+                           'or an indexed SQLite database (default: csv)')
+    parser.add_argument('--concurrency', type=int, default=1,
+                      help='Number of weeks to fetch in parallel across all seasons (default: 1)')
+    parser.add_argument('--queue-size', type=int, default=PIPELINE_QUEUE_SIZE,
+                      help=f'Weeks buffered between the fetch, process and write stages (default: {PIPELINE_QUEUE_SIZE})')
+    parser.add_argument('--cache-dir', type=str, default=RESPONSE_CACHE_DIR,
+                      help=f'Directory for the on-disk ESPN response cache (default: {RESPONSE_CACHE_DIR})')
+    parser.add_argument('--no-cache', action='store_true',
+                      help='Always download from ESPN instead of using the response cache')
+    parser.add_argument('--rate-limit', type=float, default=RATE_LIMIT_PER_SECOND,
+                      help=f'Maximum sustained ESPN requests per second (default: {RATE_LIMIT_PER_SECOND})')
+    parser.add_argument('--burst', type=int, default=RATE_LIMIT_BURST,
+                      help=f'Requests allowed back-to-back before throttling (default: {RATE_LIMIT_BURST})')
+    parser.add_argument('--incremental', action='store_true',
+                      help='Keep existing CSVs and only fetch weeks that are missing or not yet final')
+    parser.add_argument('--resume', action='store_true',
+                      help='Continue an interrupted scrape from its last checkpointed week')
+    parser.add_argument('--record', type=str, metavar='DIR',
+                      help='Save every ESPN response under its request key for replay by espn_stub_server.py')
+    parser.add_argument('--base-url', type=str,
+                      help='Override the ESPN API base URL (e.g. a local espn_stub_server.py)')
+    return parser.parse_args(argv)
 
 def validate_arguments(args) -> bool:
     """Validate command line arguments."""
@@ -45,34 +73,45 @@ def validate_arguments(args) -> bool:
     if args.week and (args.week < 1 or args.week > MAX_WEEK):
         logging.error(f"Invalid week number: {args.week}")
         return False
-        
-    return True
-
-def clear_existing_csv_files(output_dir: str):
-    """Clear existing CSV files before starting a new scrape."""
-    csv_files = [OUTPUT_FILES['matchups'], OUTPUT_FILES['player_stats'], OUTPUT_FILES['team_stats']]
     
-    for csv_file in csv_files:
-        file_path = os.path.join(output_dir, csv_file)
-        if os.path.exists(file_path):
-            os.remove(file_path)
-            logging.info(f"Cleared existing file: {csv_file}")
-
-def has_week_been_played(boxscore_data: dict, requested_week: int) -> bool:
-    """Check if a week has been played by finding matchups for that specific week.
+    if args.concurrency < 1:
+        logging.error(f"Invalid concurrency: {args.concurrency}")
+        return False
     
-    ESPN returns all matchups for the season in the 'schedule' field.
-    We need to find matchups where matchupPeriodId == requested_week and check if they have scores.
-    """
-    if not boxscore_data:
+    if args.queue_size < 1:
+        logging.error(f"Invalid queue size: {args.queue_size}")
         return False
     
-    schedule = boxscore_data.get('schedule', [])
-    if not schedule:
+    if args.rate_limit <= 0 or args.burst < 1:
+        logging.error(f"Invalid rate limit: {args.rate_limit}/s with burst {args.burst}")
         return False
     
+    if args.resume and args.incremental:
+        logging.error("--resume and --incremental cannot be combined")
+        return False
+    
+    if args.format == 'parquet' and not ParquetStore.available():
+        logging.error(f"--format parquet: {MISSING_PYARROW}")
+        return False
+        
+    return True
+
+def create_sink(output_format: str, output_dir: str):
+    """Build the writer for an output format."""
+    if output_format == 'parquet':
+        return ParquetStore(output_dir)
+    if output_format == 'sqlite':
+        return LeagueStore(output_dir)
+    return CSVGenerator(output_dir)
+
+def has_week_been_played(week_matchups: list, requested_week: int) -> bool:
+    """Check if a week has been played by finding scored matchups for that specific week.
+    
+    Takes matchups from the season schedule (see DataProcessor.week_schedule) and
+    checks those where matchupPeriodId == requested_week for actual scores.
+    """
     # Find matchups for the requested week
-    week_matchups = [m for m in schedule if m.get('matchupPeriodId') == requested_week]
+    week_matchups = [m for m in week_matchups or [] if m.get('matchupPeriodId') == requested_week]
     
     if not week_matchups:
         # No matchups found for this week (week doesn't exist)
@@ -90,10 +129,10 @@ def has_week_been_played(boxscore_data: dict, requested_week: int) -> bool:
     # All matchups for this week have 0 scores
     return False
 
-def main():
+def main(argv=None):
     """Main execution function."""
     setup_logging()
-    args = parse_arguments()
+    args = parse_arguments(argv)
     
     if not validate_arguments(args):
         sys.exit(1)
@@ -107,70 +146,149 @@ def main():
     else:
         logging.info("No authentication credentials found - accessing public league only")
 
-    # Clear existing CSV files to start fresh
-    clear_existing_csv_files(args.output)
-
-    csv_generator = CSVGenerator(args.output)
+    # Output sink: CSV files, a Parquet dataset or a SQLite database, all written one (season, week) unit at a time
+    sink = create_sink(args.format, args.output)
+    run_key = {'league_id': args.league_id, 'years': sorted(args.years), 'week': args.week,
+               'format': args.format}
+    checkpoint = CheckpointManifest(args.output, run_key)
+    persisted_units = set()
+    
+    if args.incremental:
+        # Keep what is already on disk; only missing or not-yet-final weeks are refetched.
+        # Upserts rewrite the files, so an earlier run's byte offsets no longer describe them.
+        checkpoint.clear()
+        checkpoint = None
+        persisted_units = sink.persisted_units()
+        logging.info(f"Incremental mode: {len(persisted_units)} weeks already persisted")
+    else:
+        # Drop anything written after the last committed week
+        if args.resume and checkpoint.load() and checkpoint.restore(sink.checkpoint_files()):
+            logging.info(f"Resuming: {len(checkpoint.completed)} weeks already committed")
+        else:
+            if args.resume:
+                logging.info("No usable checkpoint for this run - starting fresh")
+            # Clear existing output to start fresh
+            sink.clear()
+            checkpoint.clear()
     
     # Determine weeks to process
     weeks = [args.week] if args.week else range(1, MAX_WEEK + 1)
     
-    # Loop through each year
+    # One pooled keep-alive session is shared by every season's API client
+    session = create_session(max(HTTP_POOL_SIZE, args.concurrency))
+    cache = None if args.no_cache else ResponseCache(args.cache_dir)
+    rate_limiter = RateLimiter(args.rate_limit, args.burst)
+    
+    # Set up an API client and processor for each season
+    seasons = {}
     for year in args.years:
         logging.info(f"Processing season {year}...")
         
         # Initialize API for this year with optional authentication
-        api = ESPNFantasyAPI(args.league_id, year, espn_s2=espn_s2, swid=swid)
+        api = ESPNFantasyAPI(args.league_id, year, espn_s2=espn_s2, swid=swid, session=session, cache=cache,
+                             rate_limiter=rate_limiter, base_url=args.base_url, record_dir=args.record)
         
-        # Validate league
-        if not api.validate_league():
+        # Validate league; the league data it fetched is reused below
+        league_data = api.validate_league()
+        if not league_data:
             logging.error(f"Invalid or inaccessible league ID: {args.league_id} for season {year}")
             continue
 
-        # Get league data
-        league_data = api.get_league_data()
-        if not league_data:
-            logging.error(f"Failed to fetch league data for season {year}")
+        # An incremental refresh has nothing to do for a season whose weeks are all persisted and
+        # final, so it doesn't need the schedule either (weeks after a completed season's last
+        # scoring period have no games)
+        if args.incremental and all(
+                ((year, week) in persisted_units and api.is_week_final(week))
+                or (api.season_complete and week >= api.current_scoring_period)
+                for week in weeks):
+            logging.info(f"Skipping season {year} - every week already persisted and final")
             continue
 
-        data_processor = DataProcessor(league_data)
-        
-        # Process each week for this year
+        # The season schedule is downloaded once and sliced per week by the processor
+        schedule_data = api.get_season_schedule()
+        if not schedule_data:
+            logging.error(f"Failed to fetch schedule for season {year}")
+            continue
+
+        seasons[year] = (api, DataProcessor(league_data, schedule_data.get('schedule', [])))
+    
+    # Only weeks that have been played need their rosters downloaded
+    units = []
+    for year, (api, data_processor) in seasons.items():
         for week in weeks:
-            logging.info(f"Processing {year} week {week}...")
+            if not has_week_been_played(data_processor.week_schedule(week), week):
+                logging.info(f"Skipping {year} week {week} - no games played yet")
+            elif (year, week) in persisted_units and api.is_week_final(week):
+                logging.debug(f"Skipping {year} week {week} - already persisted and final")
+            elif checkpoint and checkpoint.is_complete(year, week):
+                logging.debug(f"Skipping {year} week {week} - already checkpointed")
+            else:
+                units.append((year, week))
+    
+    # Fetch, process and write run as pipeline stages so network waits overlap pandas and disk work.
+    # Weeks from all seasons flow through in (season, week) order.
+    def fetch_week_rosters(unit):
+        year, week = unit
+        logging.info(f"Fetching {year} week {week}...")
+        return seasons[year][0].get_week_rosters(week)
+    
+    def process_week(unit, boxscore_data):
+        year, week = unit
+        data_processor = seasons[year][1]
+        logging.info(f"Processing {year} week {week}...")
+        
+        if not boxscore_data:
+            logging.warning(f"Skipping {year} week {week} - no data available")
+            return None
+
+        try:
+            # Process data
+            matchups_df = data_processor.process_matchups(boxscore_data, week)
+            player_stats_df = data_processor.process_player_stats(boxscore_data, week)
+            team_stats_df = data_processor.process_team_stats(boxscore_data, week)
             
-            # Fetch boxscore data
-            boxscore_data = api.get_boxscore(week)
-            if not boxscore_data:
-                logging.warning(f"Skipping {year} week {week} - no data available")
-                continue
+            # Add season column to track which year the data is from
+            matchups_df['season'] = year
+            player_stats_df['season'] = year
+            team_stats_df['season'] = year
+        except Exception as e:
+            logging.error(f"Error processing {year} week {week}: {e}")
+            return None
+        
+        return {'matchups': matchups_df, 'player_stats': player_stats_df, 'team_stats': team_stats_df}
+    
+    def write_week(unit, frames):
+        year, week = unit
+        try:
+            # Save the week; incremental runs replace any rows already stored for it.
+            # Buffered sinks report which weeks actually reached disk, and only those are checkpointed.
+            written = sink.write_unit(year, week, frames, replace=args.incremental)
+            if checkpoint:
+                checkpoint.commit(written, sink.checkpoint_files())
             
-            # Check if the week has been played (matchupPeriodId matches requested week)
-            if not has_week_been_played(boxscore_data, week):
-                logging.info(f"Skipping {year} week {week} - no games played yet")
-                continue
-
-            try:
-                # Process data
-                matchups_df = data_processor.process_matchups(boxscore_data, week)
-                player_stats_df = data_processor.process_player_stats(boxscore_data, week)
-                team_stats_df = data_processor.process_team_stats(boxscore_data, week)
-                
-                # Add season column to track which year the data is from
-                matchups_df['season'] = year
-                player_stats_df['season'] = year
-                team_stats_df['season'] = year
-
-                # Save to CSV
-                csv_generator.append_to_csv(matchups_df, OUTPUT_FILES['matchups'])
-                csv_generator.append_to_csv(player_stats_df, OUTPUT_FILES['player_stats'])
-                csv_generator.append_to_csv(team_stats_df, OUTPUT_FILES['team_stats'])
-                
-                logging.info(f"Successfully processed {year} week {week}")
-                
-            except Exception as e:
-                logging.error(f"Error processing {year} week {week}: {e}")
-                continue
+            logging.info(f"Successfully processed {year} week {week}")
+            
+        except Exception as e:
+            logging.error(f"Error writing {year} week {week}: {e}")
+            if checkpoint:
+                # Roll back any tables a failed batch had already been appended to
+                checkpoint.restore(sink.checkpoint_files())
+    
+    pipeline = Pipeline(fetch_week_rosters, process_week, write_week,
+                        fetch_workers=args.concurrency, queue_size=args.queue_size)
+    pipeline.run(units)
+    pipeline.log_summary()
+
+    written = sink.flush()
+    if checkpoint:
+        checkpoint.commit(written, sink.checkpoint_files())
+
+    if cache:
+        stats = cache.session_stats()
+        lookups = stats['hits'] + stats['misses']
+        hit_rate = stats['hits'] / lookups * 100 if lookups else 0
+        logging.info(f"Response cache: {stats['hits']}/{lookups} hits ({hit_rate:.1f}%), "
+                     f"{stats['bytes_saved'] / 1024:.0f} KB served from disk")
 
     logging.info("Data scraping completed successfully")
 
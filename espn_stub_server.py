@@ -0,0 +1,155 @@
+"""
+Local stand-in for the ESPN Fantasy API that replays recorded responses.
+
+Record fixtures with `python espn_ff_scraper.py ... --record fixtures/` (or ESPN_RECORD_DIR
+for team_analysis.py), then serve them on the same URL shape as ESPN_FF_BASE_URL:
+
+    python espn_stub_server.py --recordings fixtures/ --port 8765 --latency 80 --error-rate 0.05
+    ESPN_FF_BASE_URL=http://127.0.0.1:8765/apis/v3/games/ffl python team_analysis.py
+
+Latency and error injection make it usable for load-testing concurrency, rate limiting
+and cache changes without touching ESPN.
+"""
+import argparse
+import logging
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from config import ESPN_FF_BASE_URL
+from response_cache import ResponseCache, request_key
+
+LEAGUE_PATH = re.compile(r'/seasons/(\d+)/segments/0/leagues/(\d+)/?$')
+
+class StubSettings:
+    """Replay behaviour shared by all handler threads."""
+    def __init__(self, recordings: str, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 503, retry_after: Optional[float] = None):
+        self.store = ResponseCache(recordings, ttl=float('inf'), track_stats=False)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+        self.counts = {'served': 0, 'missing': 0, 'injected_errors': 0}
+
+    def count(self, name: str):
+        with self.lock:
+            self.counts[name] += 1
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """Serve GET /.../seasons/{year}/segments/0/leagues/{id} from the recordings directory."""
+    settings: StubSettings = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        logging.debug("%s - %s", self.address_string(), format % args)
+
+    def _send(self, status: int, body: bytes, headers: Optional[dict] = None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        settings = self.settings
+        delay = settings.latency_ms + random.uniform(0, settings.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+        if settings.error_rate > 0 and random.random() < settings.error_rate:
+            settings.count('injected_errors')
+            headers = {'Retry-After': str(settings.retry_after)} if settings.retry_after is not None else None
+            self._send(settings.error_status, b'{"messages":["injected error"]}', headers)
+            return
+
+        parsed = urlsplit(self.path)
+        match = LEAGUE_PATH.search(parsed.path)
+        if not match:
+            self._send(404, b'{"messages":["unknown endpoint"]}')
+            return
+
+        season, league_id = int(match.group(1)), int(match.group(2))
+        key = request_key(league_id, season, parse_query(parsed.query),
+                          self.headers.get('x-fantasy-filter'))
+        body = settings.store.get(key)
+        if body is None:
+            settings.count('missing')
+            logging.warning(f"No recording for {self.path}")
+            self._send(404, b'{"messages":["no recording for this request"]}')
+            return
+
+        settings.count('served')
+        self._send(200, body)
+
+def parse_query(query: str) -> dict:
+    """Turn a query string into the params dict shape ESPNFantasyAPI sends."""
+    parsed = parse_qs(query)
+    params = {}
+    if 'view' in parsed:
+        params['view'] = parsed['view']
+    if 'scoringPeriodId' in parsed:
+        params['scoringPeriodId'] = parsed['scoringPeriodId'][0]
+    return params
+
+def start_server(settings: StubSettings, host: str = '127.0.0.1', port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Start the stub server on a background thread.
+
+    Returns the server (call shutdown() when done) and a base URL to pass to
+    ESPNFantasyAPI(base_url=...) or the ESPN_FF_BASE_URL environment variable.
+    """
+    handler = type('BoundReplayHandler', (ReplayHandler,), {'settings': settings})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_path = urlsplit(ESPN_FF_BASE_URL).path
+    return server, f"http://{host}:{server.server_address[1]}{base_path}"
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay recorded ESPN API responses locally')
+    parser.add_argument('--recordings', type=str, required=True,
+                      help='Directory written by --record / ESPN_RECORD_DIR')
+    parser.add_argument('--host', type=str, default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0,
+                      help='Added latency per request in milliseconds')
+    parser.add_argument('--jitter', type=float, default=0.0,
+                      help='Extra random latency of up to this many milliseconds')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                      help='Fraction of requests answered with --error-status (0-1)')
+    parser.add_argument('--error-status', type=int, default=503,
+                      help='HTTP status used for injected errors (default: 503)')
+    parser.add_argument('--retry-after', type=float,
+                      help='Retry-After seconds sent with injected errors')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
+                        handlers=[logging.StreamHandler(sys.stdout)])
+
+    settings = StubSettings(args.recordings, args.latency, args.jitter,
+                            args.error_rate, args.error_status, args.retry_after)
+    server, base_url = start_server(settings, args.host, args.port)
+    logging.info(f"Replaying {args.recordings} at {base_url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        logging.info(f"Served {settings.counts['served']} responses, {settings.counts['missing']} missing, "
+                     f"{settings.counts['injected_errors']} injected errors")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,14 @@
+"""JSON decoding for ESPN payloads: orjson when installed, stdlib json otherwise."""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def loads(data: bytes) -> Any:
+    """Decode a complete response body, using orjson if it is available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,125 @@
+"""Embedded SQLite league store: an indexed, upsert-based alternative to the CSV files."""
+import logging
+import os
+import sqlite3
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import pandas as pd
+
+from config import CSV_HEADERS, SQLITE_DB
+from schema import PARTITION_COLUMNS, PRIMARY_KEYS, column_types, table_columns
+
+SQL_TYPES = {
+    'int32': 'INTEGER',
+    'int64': 'INTEGER',
+    'float64': 'REAL',
+    'bool': 'INTEGER',
+    'string': 'TEXT'
+}
+
+# Secondary indexes: (table, columns)
+INDEXES = [
+    ('matchups', ['team_name', 'opponent_name']),
+    ('player_stats', ['player_id']),
+    ('player_stats', ['team_name']),
+    ('team_stats', ['team_name'])
+]
+
+class LeagueStore:
+    """
+    matchups, player_stats and team_stats in one SQLite file, keyed by PRIMARY_KEYS.
+
+    Every week is written in a single transaction: its old rows are dropped and the new
+    ones upserted, so rewriting a week is idempotent and a crash leaves either the old
+    or the new week, never a mix. Lookups by team or player use secondary indexes
+    instead of scanning every season.
+    """
+    def __init__(self, output_dir: str = ".", filename: str = SQLITE_DB):
+        os.makedirs(output_dir, exist_ok=True)
+        self.path = os.path.join(output_dir, filename)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self._create_tables()
+
+    def _create_tables(self):
+        with self.conn:
+            for table in CSV_HEADERS:
+                columns = ', '.join(f'{column} {SQL_TYPES[type_name]} NOT NULL'
+                                    for column, type_name in column_types(table).items())
+                primary_key = ', '.join(PRIMARY_KEYS[table])
+                self.conn.execute(f'CREATE TABLE IF NOT EXISTS {table} ({columns}, PRIMARY KEY ({primary_key}))')
+            for table, columns in INDEXES:
+                self.conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_{"_".join(columns)} '
+                                  f'ON {table} ({", ".join(columns)})')
+
+    def _upsert_sql(self, table: str) -> str:
+        columns = table_columns(table)
+        updates = ', '.join(f'{column} = excluded.{column}'
+                            for column in columns if column not in PRIMARY_KEYS[table])
+        return (f'INSERT INTO {table} ({", ".join(columns)}) VALUES ({", ".join("?" * len(columns))}) '
+                f'ON CONFLICT ({", ".join(PRIMARY_KEYS[table])}) DO UPDATE SET {updates}')
+
+    def write_unit(self, season: int, week: int, frames: Dict[str, pd.DataFrame],
+                   replace: bool = False) -> List[Tuple[int, int]]:
+        """Replace one week of every table in a single transaction."""
+        with self.conn:
+            for table, df in frames.items():
+                self.conn.execute(f'DELETE FROM {table} WHERE season = ? AND week = ?', (season, week))
+                rows = df.reindex(columns=table_columns(table)).astype(object).itertuples(index=False, name=None)
+                self.conn.executemany(self._upsert_sql(table), rows)
+        logging.info(f"Successfully wrote {season} week {week} to {self.path}")
+        return [(season, week)]
+
+    def flush(self) -> List[Tuple[int, int]]:
+        """Weeks are committed as they are written; nothing is buffered."""
+        return []
+
+    def checkpoint_files(self) -> List[str]:
+        """Week writes are transactional, so there are no byte offsets to checkpoint."""
+        return []
+
+    def persisted_units(self) -> Set[Tuple[int, int]]:
+        """Return the (season, week) pairs present in every table."""
+        units = None
+        for table in CSV_HEADERS:
+            table_units = set(self.conn.execute(f'SELECT DISTINCT season, week FROM {table}').fetchall())
+            units = table_units if units is None else units & table_units
+        return units or set()
+
+    def clear(self):
+        """Delete every row before a fresh scrape."""
+        with self.conn:
+            for table in CSV_HEADERS:
+                self.conn.execute(f'DELETE FROM {table}')
+        logging.info(f"Cleared existing tables in {self.path}")
+
+    def close(self):
+        self.conn.close()
+
+    def query(self, sql: str, params: Sequence = ()) -> pd.DataFrame:
+        """Run a read-only SQL query and return the result as a DataFrame."""
+        return pd.read_sql_query(sql, self.conn, params=params)
+
+    def read_table(self, table: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Load a table in (season, week) order, with columns cast to their schema types."""
+        columns = [column for column in table_columns(table) if columns is None or column in columns]
+        df = self.query(f'SELECT {", ".join(columns)} FROM {table} ORDER BY {", ".join(PARTITION_COLUMNS)}, rowid')
+        types = column_types(table)
+        return df.astype({column: types[column] for column in columns if types[column] != 'string'})
+
+    def head_to_head(self, team_name: str, opponent_name: str) -> pd.DataFrame:
+        """Every meeting between two teams across all seasons, from team_name's side."""
+        return self.query(
+            'SELECT season, week, team_score, opponent_score, winner FROM matchups '
+            'WHERE team_name = ? AND opponent_name = ? ORDER BY season, week',
+            (team_name, opponent_name)
+        ).astype({'winner': 'bool'})
+
+    def player_weeks(self, player_id: int) -> pd.DataFrame:
+        """One row per week a player was rostered, across all seasons."""
+        return self.query(
+            'SELECT season, week, team_name, slot_position, points, projected_points FROM player_stats '
+            'WHERE player_id = ? ORDER BY season, week',
+            (player_id,)
+        )
@@ -0,0 +1,145 @@
+"""Parquet output backend, partitioned by season and week."""
+import logging
+import os
+import shutil
+import tempfile
+from typing import Dict, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from config import CSV_HEADERS, PARQUET_DIR
+from schema import PARTITION_COLUMNS, arrow_schema, coerce_frame, table_columns
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+PART_FILE = 'part-0.parquet'
+COMPRESSION = 'zstd'
+MISSING_PYARROW = "The Parquet backend requires pyarrow: install the parquet extra (uv sync --extra parquet)"
+
+class ParquetStore:
+    """
+    Writes matchups, player_stats and team_stats as hive-partitioned Parquet datasets:
+
+        <output_dir>/parquet/<table>/season=2024/week=3/part-0.parquet
+
+    Each (season, week) partition is replaced atomically (temp file plus rename), so
+    rewriting a week is an upsert and a crash never leaves a half-written file.
+    Readers get column pruning and partition/row-group predicate pushdown.
+    """
+    def __init__(self, output_dir: str = ".", root: str = PARQUET_DIR):
+        if pa is None:
+            raise ImportError(MISSING_PYARROW)
+        self.root = os.path.join(output_dir, root)
+        os.makedirs(self.root, exist_ok=True)
+
+    @staticmethod
+    def available() -> bool:
+        return pa is not None
+
+    def table_dir(self, table: str) -> str:
+        return os.path.join(self.root, table)
+
+    def partition_dir(self, table: str, season: int, week: int) -> str:
+        return os.path.join(self.table_dir(table), f'season={season}', f'week={week}')
+
+    def write_unit(self, season: int, week: int, frames: Dict[str, pd.DataFrame],
+                   replace: bool = False) -> List[Tuple[int, int]]:
+        """Write one week of every table, replacing any partition already on disk."""
+        for table, df in frames.items():
+            partition = self.partition_dir(table, season, week)
+            os.makedirs(partition, exist_ok=True)
+            
+            data = coerce_frame(df, table).drop(columns=PARTITION_COLUMNS)
+            arrow_table = pa.Table.from_pandas(data, schema=arrow_schema(table, include_partitions=False),
+                                               preserve_index=False)
+            # The pandas metadata blob is larger than a typical week's data; the schema module covers it
+            arrow_table = arrow_table.replace_schema_metadata(None)
+            
+            fd, tmp_path = tempfile.mkstemp(dir=partition, suffix='.tmp')
+            os.close(fd)
+            try:
+                pq.write_table(arrow_table, tmp_path, compression=COMPRESSION)
+                os.replace(tmp_path, os.path.join(partition, PART_FILE))
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        logging.info(f"Successfully wrote {season} week {week} to {self.root}")
+        return [(season, week)]
+
+    def flush(self) -> List[Tuple[int, int]]:
+        """Partitions are written as they arrive; nothing is buffered."""
+        return []
+
+    def checkpoint_files(self) -> List[str]:
+        """Partition writes are atomic, so there are no byte offsets to checkpoint."""
+        return []
+
+    def _table_units(self, table: str) -> Set[Tuple[int, int]]:
+        units = set()
+        table_dir = self.table_dir(table)
+        if not os.path.isdir(table_dir):
+            return units
+        for season_dir in os.listdir(table_dir):
+            if not season_dir.startswith('season='):
+                continue
+            for week_dir in os.listdir(os.path.join(table_dir, season_dir)):
+                if week_dir.startswith('week=') and \
+                        os.path.exists(os.path.join(table_dir, season_dir, week_dir, PART_FILE)):
+                    units.add((int(season_dir[len('season='):]), int(week_dir[len('week='):])))
+        return units
+
+    def persisted_units(self) -> Set[Tuple[int, int]]:
+        """Return the (season, week) pairs present in every table."""
+        units = None
+        for table in CSV_HEADERS:
+            table_units = self._table_units(table)
+            units = table_units if units is None else units & table_units
+        return units or set()
+
+    def clear(self):
+        """Remove every table's dataset before a fresh scrape."""
+        for table in CSV_HEADERS:
+            if os.path.isdir(self.table_dir(table)):
+                shutil.rmtree(self.table_dir(table))
+                logging.info(f"Cleared existing dataset: {table}")
+
+    def last_modified(self, table: str) -> Optional[float]:
+        """Newest mtime of any partition file in a table, or None if the table is empty."""
+        newest = None
+        for dirpath, _, filenames in os.walk(self.table_dir(table)):
+            for filename in filenames:
+                if filename == PART_FILE:
+                    mtime = os.path.getmtime(os.path.join(dirpath, filename))
+                    newest = mtime if newest is None else max(newest, mtime)
+        return newest
+
+    def read_table(self, table: str, columns: Optional[List[str]] = None,
+                   filters: Optional[List[Tuple]] = None) -> pd.DataFrame:
+        """
+        Load a table as a DataFrame.
+
+        `columns` limits which columns are decoded; `filters` uses the
+        pyarrow/pandas list-of-tuples form, e.g. [('season', '>=', 2022), ('team_id', '==', 3)].
+        Filters on season/week skip whole partitions; other filters use row-group statistics.
+        """
+        partitioning = ds.partitioning(
+            pa.schema([field for field in arrow_schema(table) if field.name in PARTITION_COLUMNS]),
+            flavor='hive'
+        )
+        dataset = ds.dataset(self.table_dir(table), format='parquet', partitioning=partitioning,
+                             schema=arrow_schema(table))
+        columns = [column for column in table_columns(table) if columns is None or column in columns]
+        expression = pq.filters_to_expression(filters) if filters else None
+        result = dataset.to_table(columns=columns, filter=expression).to_pandas()
+        
+        # Fragments come back in path order (week=10 before week=2); restore season/week order
+        sort_columns = [column for column in PARTITION_COLUMNS if column in columns]
+        if sort_columns:
+            result = result.sort_values(sort_columns, kind='mergesort', ignore_index=True)
+        return result
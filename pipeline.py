@@ -0,0 +1,204 @@
+"""Bounded producer/consumer pipeline for the scraper: fetch -> process -> write."""
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from config import PIPELINE_QUEUE_SIZE
+
+_DONE = object()
+
+def fetch_in_order(units: Iterable[Any], fetch: Callable[[Any], Any],
+                   concurrency: int) -> Iterator[Tuple[Any, Any]]:
+    """Run fetch(unit) for every unit and yield (unit, result) in the original unit order.
+    
+    With concurrency > 1 the fetches run on a thread pool. At most 2 x concurrency
+    results are in flight or buffered at once, so memory stays bounded while the
+    caller processes earlier units.
+    """
+    if concurrency <= 1:
+        for unit in units:
+            yield unit, fetch(unit)
+        return
+    
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = deque()
+        for unit in units:
+            pending.append((unit, executor.submit(fetch, unit)))
+            if len(pending) >= concurrency * 2:
+                done_unit, future = pending.popleft()
+                yield done_unit, future.result()
+        while pending:
+            done_unit, future = pending.popleft()
+            yield done_unit, future.result()
+
+@dataclass
+class StageCounter:
+    """
+    Throughput counters for one pipeline stage.
+    
+    busy_seconds is time spent in the stage's own work (summed over workers),
+    starved_seconds is time waiting for input, and blocked_seconds is time waiting
+    for room in the next stage's queue (back-pressure). A stage that is mostly
+    blocked is faster than its consumer; one that is mostly starved is waiting on
+    its producer.
+    """
+    name: str
+    items: int = 0
+    busy_seconds: float = 0.0
+    starved_seconds: float = 0.0
+    blocked_seconds: float = 0.0
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def add_busy(self, seconds: float):
+        with self._lock:
+            self.busy_seconds += seconds
+            self.items += 1
+
+    def summary(self, elapsed: float) -> str:
+        rate = self.items / elapsed if elapsed > 0 else 0
+        return (f"{self.name}: {self.items} items ({rate:.1f}/s), busy {self.busy_seconds:.2f}s, "
+                f"starved {self.starved_seconds:.2f}s, blocked {self.blocked_seconds:.2f}s")
+
+class Pipeline:
+    """
+    Three stages connected by bounded queues:
+    
+        fetch (fetch_workers threads, results kept in unit order)
+          -> queue -> process (one thread) -> queue -> write (calling thread)
+    
+    Network waits in the fetch stage overlap pandas work in the process stage and
+    disk writes in the write stage. When a queue is full its producer blocks, so at
+    most queue_size units sit between any two stages. Units stay in their original
+    order end to end.
+    
+    `process(unit, data)` returns what `write(unit, result)` should store, or None to
+    skip the unit. Both should log and swallow per-unit errors; an exception that
+    escapes any stage stops the whole pipeline and is re-raised from run().
+    """
+    def __init__(self, fetch: Callable[[Any], Any], process: Callable[[Any, Any], Any],
+                 write: Callable[[Any, Any], None], fetch_workers: int = 1,
+                 queue_size: int = PIPELINE_QUEUE_SIZE):
+        self.fetch = fetch
+        self.process = process
+        self.write = write
+        self.fetch_workers = fetch_workers
+        self.queue_size = max(queue_size, 1)
+        self.counters = {name: StageCounter(name) for name in ('fetch', 'process', 'write')}
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+
+    def _put(self, target: queue.Queue, item: Any, counter: StageCounter) -> bool:
+        """Put with back-pressure; returns False if the pipeline is stopping."""
+        started = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                try:
+                    target.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        finally:
+            counter.blocked_seconds += time.perf_counter() - started
+
+    def _get(self, source: queue.Queue, counter: StageCounter) -> Any:
+        """Blocking get; returns _DONE if the pipeline is stopping."""
+        started = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                try:
+                    return source.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            return _DONE
+        finally:
+            counter.starved_seconds += time.perf_counter() - started
+
+    def _fail(self, error: BaseException):
+        if self._error is None:
+            self._error = error
+        self._stop.set()
+
+    def _timed_fetch(self, unit: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return self.fetch(unit)
+        finally:
+            self.counters['fetch'].add_busy(time.perf_counter() - started)
+
+    def _fetch_stage(self, units: Iterable[Any], output: queue.Queue):
+        counter = self.counters['fetch']
+        try:
+            for unit, data in fetch_in_order(units, self._timed_fetch, self.fetch_workers):
+                if not self._put(output, (unit, data), counter):
+                    return
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            self._put(output, _DONE, counter)
+
+    def _process_stage(self, source: queue.Queue, output: queue.Queue):
+        counter = self.counters['process']
+        try:
+            while True:
+                item = self._get(source, counter)
+                if item is _DONE:
+                    return
+                unit, data = item
+                started = time.perf_counter()
+                result = self.process(unit, data)
+                counter.add_busy(time.perf_counter() - started)
+                if result is not None and not self._put(output, (unit, result), counter):
+                    return
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            self._put(output, _DONE, counter)
+
+    def run(self, units: Iterable[Any]) -> Dict[str, StageCounter]:
+        """Push every unit through the pipeline; returns the per-stage counters."""
+        fetched = queue.Queue(maxsize=self.queue_size)
+        processed = queue.Queue(maxsize=self.queue_size)
+        threads = [
+            threading.Thread(target=self._fetch_stage, args=(units, fetched), name='pipeline-fetch', daemon=True),
+            threading.Thread(target=self._process_stage, args=(fetched, processed), name='pipeline-process', daemon=True)
+        ]
+        
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        
+        counter = self.counters['write']
+        try:
+            while True:
+                item = self._get(processed, counter)
+                if item is _DONE:
+                    break
+                unit, result = item
+                write_started = time.perf_counter()
+                self.write(unit, result)
+                counter.add_busy(time.perf_counter() - write_started)
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+            self.elapsed = time.perf_counter() - started
+        
+        if self._error is not None:
+            raise self._error
+        return self.counters
+
+    def log_summary(self):
+        logging.info(f"Pipeline finished in {self.elapsed:.2f}s")
+        for counter in self.counters.values():
+            logging.info(f"  {counter.summary(self.elapsed)}")
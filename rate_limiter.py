@@ -0,0 +1,84 @@
+"""Token-bucket rate limiting and retry backoff for ESPN API requests."""
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from config import (RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST, RATE_LIMIT_MIN_PER_SECOND,
+                    BACKOFF_BASE_SECONDS, BACKOFF_MAX_SECONDS)
+
+class RateLimiter:
+    """
+    Thread-safe token bucket shared by every request of a run.
+
+    Tokens refill at `rate` per second up to `burst`. The rate adapts AIMD-style:
+    each throttling response (429/503) halves it, down to `min_rate`, and each
+    success creeps it back toward the configured ceiling. A Retry-After pause
+    blocks all callers, not just the one that was throttled.
+    """
+    def __init__(self, rate: float = RATE_LIMIT_PER_SECOND, burst: int = RATE_LIMIT_BURST,
+                 min_rate: float = RATE_LIMIT_MIN_PER_SECOND):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._last_refill
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                else:
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def penalize(self):
+        """Multiplicative decrease after the server signals throttling."""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = min(self._tokens, 1.0)
+
+    def reward(self):
+        """Additive increase after a successful request."""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+    def pause(self, seconds: float):
+        """Hold every caller for at least `seconds` (e.g. a Retry-After)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE_SECONDS, cap: float = BACKOFF_MAX_SECONDS) -> float:
+    """Exponential backoff with full jitter for the given 0-based retry attempt."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date), or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
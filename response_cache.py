@@ -0,0 +1,256 @@
+"""Persistent, content-addressed on-disk cache for ESPN API responses."""
+import argparse
+import atexit
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional
+
+from config import RESPONSE_CACHE_DIR, RESPONSE_CACHE_TTL
+
+STATS_FILE = 'stats.json'
+
+_stat_tracking_caches = weakref.WeakSet()
+
+def request_identity(league_id: int, season: int, params: Optional[Dict[str, Any]] = None,
+                     fantasy_filter: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Reduce a league request to the fields that determine its response.
+
+    View order does not change what ESPN returns, so views are sorted; the
+    x-fantasy-filter header is re-serialized so whitespace and key order don't matter.
+    """
+    params = params or {}
+    views = params.get('view', [])
+    if isinstance(views, str):
+        views = [views]
+
+    scoring_period = params.get('scoringPeriodId')
+    if scoring_period is not None:
+        scoring_period = int(scoring_period)
+
+    if fantasy_filter:
+        try:
+            fantasy_filter = json.dumps(json.loads(fantasy_filter), sort_keys=True, separators=(',', ':'))
+        except ValueError:
+            pass
+
+    return {
+        'league_id': int(league_id),
+        'season': int(season),
+        'views': sorted(views),
+        'scoringPeriodId': scoring_period,
+        'filter': fantasy_filter or None
+    }
+
+def request_key(league_id: int, season: int, params: Optional[Dict[str, Any]] = None,
+                fantasy_filter: Optional[str] = None) -> str:
+    """Content address (sha256 hex digest) of a league request."""
+    identity = request_identity(league_id, season, params, fantasy_filter)
+    return hashlib.sha256(json.dumps(identity, sort_keys=True).encode('utf-8')).hexdigest()
+
+def _atomic_write(path: str, data: bytes):
+    """Write bytes to path via a temp file in the same directory plus rename."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+class ResponseCache:
+    """
+    Raw response bodies stored under their request key.
+
+    Entries for finalized scoring periods never expire; everything else (current week,
+    rosters, settings) is served only while younger than `ttl` seconds. Hit/miss counters
+    are kept in memory and merged into stats.json when the process exits.
+
+    The same layout doubles as a fixture store for record/replay (see espn_stub_server),
+    in which case stats tracking is switched off.
+    """
+    def __init__(self, cache_dir: str = RESPONSE_CACHE_DIR, ttl: float = RESPONSE_CACHE_TTL,
+                 track_stats: bool = True):
+        # Absolute, so stats flushed at exit land here even if the process has changed directory
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'bytes_saved': 0, 'bytes_fetched': 0}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        if track_stats:
+            _stat_tracking_caches.add(self)
+            atexit.register(self.flush_stats)
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2])
+
+    def body_path(self, key: str) -> str:
+        """Path of the raw response body for a key."""
+        return os.path.join(self._entry_dir(key), f"{key}.json")
+
+    def _meta_path(self, key: str) -> str:
+        return os.path.join(self._entry_dir(key), f"{key}.meta.json")
+
+    def _count(self, **increments: int):
+        with self._lock:
+            for name, value in increments.items():
+                self._stats[name] += value
+
+    def is_fresh(self, key: str) -> bool:
+        """Whether a usable (final or unexpired) entry exists for key."""
+        try:
+            with open(self._meta_path(key), 'r') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if not os.path.exists(self.body_path(key)):
+            return False
+        return meta.get('final', False) or (time.time() - meta.get('stored_at', 0)) < self.ttl
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached body for key, or None on a miss or expired entry."""
+        if not self.is_fresh(key):
+            self._count(misses=1)
+            return None
+        try:
+            with open(self.body_path(key), 'rb') as f:
+                body = f.read()
+        except OSError:
+            self._count(misses=1)
+            return None
+        self._count(hits=1, bytes_saved=len(body))
+        return body
+
+    def put(self, key: str, body: bytes, final: bool = False, identity: Optional[Dict[str, Any]] = None):
+        """Store a response body. Body is written before metadata so a crash never exposes a partial entry."""
+        os.makedirs(self._entry_dir(key), exist_ok=True)
+        _atomic_write(self.body_path(key), body)
+        meta = {'stored_at': time.time(), 'final': final, 'size': len(body), 'request': identity}
+        _atomic_write(self._meta_path(key), json.dumps(meta).encode('utf-8'))
+        self._count(bytes_fetched=len(body))
+
+    def mark_final(self, key: str):
+        """Keep an existing entry forever (its scoring period turned out to be final)."""
+        try:
+            with open(self._meta_path(key), 'r') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not meta.get('final'):
+            meta['final'] = True
+            _atomic_write(self._meta_path(key), json.dumps(meta).encode('utf-8'))
+
+    def discard(self, key: str):
+        """Drop an entry (e.g. a body that failed to decode) so the next request refetches it."""
+        for path in (self._meta_path(key), self.body_path(key)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def flush_stats(self):
+        """Merge this process's counters into the persistent stats file."""
+        with self._lock:
+            pending = dict(self._stats)
+            for name in self._stats:
+                self._stats[name] = 0
+        if not any(pending.values()) or not os.path.isdir(self.cache_dir):
+            return
+
+        totals = load_stats(self.cache_dir)
+        for name, value in pending.items():
+            totals[name] = totals.get(name, 0) + value
+        _atomic_write(os.path.join(self.cache_dir, STATS_FILE), json.dumps(totals).encode('utf-8'))
+
+    def session_stats(self) -> Dict[str, int]:
+        """Counters accumulated by this process since the last flush."""
+        with self._lock:
+            return dict(self._stats)
+
+def flush_all_stats():
+    """Flush the counters of every stats-tracking cache in this process (e.g. before a worker moves on)."""
+    for cache in list(_stat_tracking_caches):
+        cache.flush_stats()
+
+def load_stats(cache_dir: str) -> Dict[str, int]:
+    """Load persisted hit/miss counters for a cache directory."""
+    try:
+        with open(os.path.join(cache_dir, STATS_FILE), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'hits': 0, 'misses': 0, 'bytes_saved': 0, 'bytes_fetched': 0}
+
+def summarize_cache(cache_dir: str) -> Dict[str, Any]:
+    """Describe a cache directory: entry counts, disk use, hit rate and bytes saved."""
+    entries = 0
+    final_entries = 0
+    disk_bytes = 0
+
+    if os.path.isdir(cache_dir):
+        for root, _, files in os.walk(cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                if name.endswith('.meta.json'):
+                    entries += 1
+                    try:
+                        with open(path, 'r') as f:
+                            final_entries += 1 if json.load(f).get('final') else 0
+                    except (OSError, ValueError):
+                        pass
+                elif name != STATS_FILE:
+                    disk_bytes += os.path.getsize(path)
+
+    stats = load_stats(cache_dir)
+    lookups = stats.get('hits', 0) + stats.get('misses', 0)
+    return {
+        'entries': entries,
+        'final_entries': final_entries,
+        'disk_bytes': disk_bytes,
+        'hits': stats.get('hits', 0),
+        'misses': stats.get('misses', 0),
+        'hit_rate': stats.get('hits', 0) / lookups if lookups else 0.0,
+        'bytes_saved': stats.get('bytes_saved', 0),
+        'bytes_fetched': stats.get('bytes_fetched', 0)
+    }
+
+def _format_bytes(num: float) -> str:
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if num < 1024 or unit == 'GB':
+            return f"{num:.1f} {unit}"
+        num /= 1024
+
+def main():
+    """Command line entry point: inspect or clear the response cache."""
+    parser = argparse.ArgumentParser(description='ESPN API response cache')
+    parser.add_argument('command', choices=['stats', 'clear'],
+                      help='stats: show hit rate and bytes saved; clear: delete all entries')
+    parser.add_argument('--cache-dir', type=str, default=RESPONSE_CACHE_DIR,
+                      help=f'Cache directory (default: {RESPONSE_CACHE_DIR})')
+    args = parser.parse_args()
+
+    if args.command == 'clear':
+        if os.path.isdir(args.cache_dir):
+            shutil.rmtree(args.cache_dir)
+        print(f"Cleared {args.cache_dir}")
+        return
+
+    summary = summarize_cache(args.cache_dir)
+    print(f"Cache directory:  {args.cache_dir}")
+    print(f"Entries:          {summary['entries']} ({summary['final_entries']} final)")
+    print(f"Disk usage:       {_format_bytes(summary['disk_bytes'])}")
+    print(f"Lookups:          {summary['hits'] + summary['misses']} "
+          f"({summary['hits']} hits, {summary['misses']} misses)")
+    print(f"Hit rate:         {summary['hit_rate'] * 100:.1f}%")
+    print(f"Bytes saved:      {_format_bytes(summary['bytes_saved'])}")
+    print(f"Bytes fetched:    {_format_bytes(summary['bytes_fetched'])}")
+
+if __name__ == '__main__':
+    main()
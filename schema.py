@@ -0,0 +1,129 @@
+"""Typed column schema for the scraper's output tables, derived from config.CSV_HEADERS."""
+import logging
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from config import CSV_HEADERS
+
+# Every column in CSV_HEADERS must have an entry here
+COLUMN_TYPES = {
+    'season': 'int32',
+    'week': 'int32',
+    'matchup_id': 'int32',
+    'team_id': 'int32',
+    'team_name': 'string',
+    'opponent_id': 'int32',
+    'opponent_name': 'string',
+    'team_score': 'float64',
+    'opponent_score': 'float64',
+    'winner': 'bool',
+    'player_id': 'int64',
+    'player_name': 'string',
+    'position': 'string',
+    'slot_position': 'string',
+    'points': 'float64',
+    'projected_points': 'float64',
+    'points_for': 'float64',
+    'points_against': 'float64',
+    'weekly_rank': 'int32',
+    'wins': 'int32',
+    'top6_wins': 'int32',
+    'mvp_w': 'float64'
+}
+
+# Columns every table is keyed and partitioned by
+PARTITION_COLUMNS = ['season', 'week']
+
+# Row identity within each table
+PRIMARY_KEYS = {
+    'matchups': ['season', 'week', 'team_id'],
+    'player_stats': ['season', 'week', 'team_id', 'player_id'],
+    'team_stats': ['season', 'week', 'team_id']
+}
+
+# In-memory dtypes for analysis: small ints, categoricals for low-cardinality labels
+# and float32 for points. Storage keeps COLUMN_TYPES so nothing written out loses precision.
+COMPACT_TYPES = {
+    'season': 'int16',
+    'week': 'int8',
+    'matchup_id': 'int32',
+    'team_id': 'int16',
+    'team_name': 'category',
+    'opponent_id': 'int16',
+    'opponent_name': 'category',
+    'team_score': 'float32',
+    'opponent_score': 'float32',
+    'winner': 'bool',
+    'player_id': 'int32',
+    'position': 'category',
+    'slot_position': 'category',
+    'points': 'float32',
+    'projected_points': 'float32',
+    'points_for': 'float32',
+    'points_against': 'float32',
+    'weekly_rank': 'int8',
+    'wins': 'int8',
+    'top6_wins': 'int8',
+    'mvp_w': 'float32'
+}
+
+def table_columns(table: str) -> List[str]:
+    """Column order for a table, as written to CSV."""
+    return CSV_HEADERS[table]
+
+def column_types(table: str) -> Dict[str, str]:
+    """Map each column of a table to its type name."""
+    return {column: COLUMN_TYPES[column] for column in table_columns(table)}
+
+def coerce_frame(df: pd.DataFrame, table: str) -> pd.DataFrame:
+    """Return df with the table's columns in order and cast to their schema types."""
+    df = df.reindex(columns=table_columns(table))
+    return df.astype({column: ('object' if type_name == 'string' else type_name)
+                      for column, type_name in column_types(table).items()})
+
+def arrow_schema(table: str, include_partitions: bool = True):
+    """pyarrow schema for a table; partition columns are left out when they live in the path."""
+    import pyarrow as pa
+    arrow_types = {
+        'int32': pa.int32(),
+        'int64': pa.int64(),
+        'float64': pa.float64(),
+        'bool': pa.bool_(),
+        'string': pa.string()
+    }
+    return pa.schema([
+        (column, arrow_types[type_name])
+        for column, type_name in column_types(table).items()
+        if include_partitions or column not in PARTITION_COLUMNS
+    ])
+
+def _fits(series: pd.Series, type_name: str) -> bool:
+    """True if casting series to type_name is lossless (no NaN in ints, no integer overflow)."""
+    if not type_name.startswith('int'):
+        return True
+    if series.isna().any():
+        return False
+    if series.empty:
+        return True
+    limits = np.iinfo(type_name)
+    return limits.min <= series.min() and series.max() <= limits.max
+
+def compact_frame(df: pd.DataFrame, exact_floats: bool = False) -> pd.DataFrame:
+    """
+    Cast any known columns of df to their COMPACT_TYPES.
+
+    With exact_floats=True, point columns keep float64. Use this for frames that will be
+    written out. Columns whose values don't fit the compact type are left as they are.
+    """
+    types = {}
+    for column in df.columns:
+        type_name = COMPACT_TYPES.get(column)
+        if type_name is None or (exact_floats and type_name == 'float32'):
+            continue
+        if _fits(df[column], type_name):
+            types[column] = type_name
+        else:
+            logging.debug(f"Keeping {column} as {df[column].dtype}; values do not fit {type_name}")
+    return df.astype(types)
@@ -0,0 +1,798 @@
+"""Vectorized Monte Carlo engine behind team_analysis.monte_carlo_playoff_simulation."""
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import get_context
+from typing import Any, Dict, List, Optional
+
+MIN_SCORE = 50  # Simulated scores are floored here, as a safety net for blowup-sized injury variance
+CHUNK_SIZE = 50000  # Simulations drawn and reduced at a time; bounds peak memory whatever the total
+MIN_CHUNKS = 16  # Runs are split into at least this many chunks so a process pool has work for every core
+MIN_CHUNK_SIZE = 1000  # ...unless chunks would get smaller than this, where per-chunk overhead dominates
+MIN_POOL_SIMULATIONS = 2000000  # Smaller runs stay inline: spawned workers re-import the caller (seconds each)
+SAMPLE_SIZE = 10000  # Whole simulations kept (uniformly at random) for plots and scenario listings
+CONFIDENCE_Z = 1.96  # Two-sided 95% normal quantile for reported intervals
+ADAPTIVE_MIN_SIMULATIONS = 2000  # First adaptive batch; enough for the error estimates to mean something
+MAX_ANTITHETIC_GAIN = 10.0  # Cap on the estimated variance reduction, so a lucky early estimate can't stop a run
+MIN_ANTITHETIC_EVENTS = 50  # Occurrences (and non-occurrences) an outcome needs before its gain is estimated
+
+@dataclass
+class SeasonModel:
+    """
+    The rest of the regular season as flat arrays.
+
+    Games keep the order of remaining_schedule grouped by week. Each game owns two
+    score slots, home at 2*g and away at 2*g + 1, and mean/std hold the blended
+    expected score and adjusted spread for every slot, computed once.
+    """
+    teams: List[str]
+    current_wins: np.ndarray
+    current_points: np.ndarray
+    weeks: np.ndarray
+    home: np.ndarray
+    away: np.ndarray
+    mean: np.ndarray
+    std: np.ndarray
+
+    @property
+    def num_teams(self) -> int:
+        return len(self.teams)
+
+    @property
+    def num_games(self) -> int:
+        return len(self.home)
+
+    @property
+    def slot_teams(self) -> np.ndarray:
+        """Team index owning each score slot."""
+        return np.column_stack([self.home, self.away]).ravel()
+
+    def matchup_keys(self) -> List[str]:
+        return [f"{self.teams[h]}_vs_{self.teams[a]}" for h, a in zip(self.home, self.away)]
+
+@dataclass
+class SimulationDraw:
+    """Outcomes of num_simulations seasons; row i of every array is simulation i."""
+    scores: np.ndarray        # (sims, 2 * games) slot scores
+    home_won: np.ndarray      # (sims, games) bool, ties go to the away team
+    final_wins: np.ndarray    # (sims, teams)
+    final_points: np.ndarray  # (sims, teams)
+
+def expected_score(team_ppg: float, optimized_proj: Optional[float], espn_proj: Optional[float],
+                   projection_weight: float, historical_weight: float) -> float:
+    """Blend the optimized (else raw ESPN) projection with historical PPG; PPG alone without one."""
+    if optimized_proj and optimized_proj > 0:
+        return (projection_weight * optimized_proj) + (historical_weight * team_ppg)
+    if espn_proj and espn_proj > 0:
+        return (projection_weight * espn_proj) + (historical_weight * team_ppg)
+    return team_ppg
+
+def build_season_model(team_stats: Dict[str, Dict[str, Any]], remaining_schedule: List[Dict[str, Any]],
+                       espn_projections: Dict[int, Dict], optimized_lineups: Dict[int, Dict],
+                       projection_weight: float, historical_weight: float) -> SeasonModel:
+    """Precompute per-(week, team) score means and spreads for every remaining game."""
+    teams = list(team_stats.keys())
+    index = {team: i for i, team in enumerate(teams)}
+
+    games_by_week = {}
+    for game in remaining_schedule:
+        games_by_week.setdefault(game['week'], []).append(game)
+
+    weeks, home, away, mean, std = [], [], [], [], []
+    for week, games in games_by_week.items():
+        week_proj = espn_projections.get(week, {})
+        week_opt = optimized_lineups.get(week, {})
+
+        for game in games:
+            if game['home'] not in index or game['away'] not in index:
+                continue
+            weeks.append(week)
+            home.append(index[game['home']])
+            away.append(index[game['away']])
+
+            for team in (game['home'], game['away']):
+                stats = team_stats[team]
+                opt_data = week_opt.get(team, {})
+                mean.append(expected_score(stats['ppg'], opt_data.get('optimized_projection', None),
+                                           week_proj.get(team, {}).get('projected_points', None),
+                                           projection_weight, historical_weight))
+
+                # Injuries widen the spread, and so does a low-confidence lineup optimization
+                confidence_factor = 1.0 + (1.0 - opt_data.get('confidence', 1.0)) * 0.3
+                std.append(stats['std'] * stats.get('variance_multiplier', 1.0) * confidence_factor)
+
+    return SeasonModel(
+        teams=teams,
+        current_wins=np.array([team_stats[t]['wins'] for t in teams], dtype=np.int64),
+        current_points=np.array([team_stats[t]['points_for'] for t in teams], dtype=np.float64),
+        weeks=np.array(weeks, dtype=np.int64),
+        home=np.array(home, dtype=np.intp),
+        away=np.array(away, dtype=np.intp),
+        mean=np.array(mean, dtype=np.float64),
+        std=np.array(std, dtype=np.float64),
+    )
+
+def simulate(model: SeasonModel, num_simulations: int, rng=None, antithetic: bool = False) -> SimulationDraw:
+    """
+    Draw every remaining score for num_simulations seasons in one generator call.
+
+    rng is a numpy Generator (or legacy RandomState); a fresh default_rng() if omitted.
+    With antithetic=True rows come in pairs (2k, 2k + 1) drawn from z and -z, so each
+    pair's over- and under-performances cancel. Win and points-for totals are matrix
+    products with the game -> team incidence matrices, so no Python code runs per
+    simulation.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+
+    if antithetic:
+        half = rng.standard_normal(((num_simulations + 1) // 2, 2 * model.num_games))
+        scores = np.stack([half, -half], axis=1).reshape(-1, 2 * model.num_games)[:num_simulations]
+    else:
+        scores = rng.standard_normal((num_simulations, 2 * model.num_games))
+    scores *= model.std
+    scores += model.mean
+    np.maximum(scores, MIN_SCORE, out=scores)
+
+    home_won = scores[:, 0::2] > scores[:, 1::2]
+
+    home_incidence = np.zeros((model.num_games, model.num_teams), dtype=np.int64)
+    home_incidence[np.arange(model.num_games), model.home] = 1
+    away_incidence = np.zeros((model.num_games, model.num_teams), dtype=np.int64)
+    away_incidence[np.arange(model.num_games), model.away] = 1
+    slot_incidence = np.zeros((2 * model.num_games, model.num_teams))
+    slot_incidence[np.arange(2 * model.num_games), model.slot_teams] = 1.0
+
+    home_won_i = home_won.astype(np.int64)
+    final_wins = model.current_wins + home_won_i @ home_incidence + (1 - home_won_i) @ away_incidence
+    final_points = model.current_points + scores @ slot_incidence
+
+    return SimulationDraw(scores=scores, home_won=home_won, final_wins=final_wins, final_points=final_points)
+
+@dataclass
+class SimulationTally:
+    """Per-team counters over a batch of simulations; arrays are indexed like SeasonModel.teams."""
+    num_simulations: int
+    standings: np.ndarray           # (sims, teams) 1-based final standing
+    order: np.ndarray               # (sims, teams) team index at each standing, best first
+    seed_counts: np.ndarray         # (playoff_spots, teams) times finishing at each seed
+    points_leader_counts: np.ndarray
+    playoff_given_win: np.ndarray   # playoff finishes credited to a game won
+    playoff_given_loss: np.ndarray  # playoff finishes credited to a game lost
+    game_wins: np.ndarray           # remaining games won, summed over simulations
+    game_losses: np.ndarray
+    matchup_home_wins: np.ndarray   # (games,) simulations the home team won each game
+
+    @property
+    def playoff_counts(self) -> np.ndarray:
+        return self.seed_counts.sum(axis=0)
+
+def rank_standings(final_wins: np.ndarray, final_points: np.ndarray) -> np.ndarray:
+    """
+    Order every simulation's teams by wins, then points for, best first.
+
+    lexsort is stable, so exact ties keep team order, the same as
+    sorted(teams, key=(wins, points), reverse=True).
+    """
+    return np.lexsort((-final_points, -final_wins), axis=-1)
+
+def last_meetings(model: SeasonModel) -> np.ndarray:
+    """Game index of each matchup key's last meeting (conditional odds are credited per key)."""
+    return np.array(list({key: g for g, key in enumerate(model.matchup_keys())}.values()), dtype=np.intp)
+
+def in_playoffs(final_wins: np.ndarray, final_points: np.ndarray, team: int, playoff_spots: int) -> np.ndarray:
+    """
+    Whether one team finishes in the playoff spots, per simulation.
+
+    Counts the teams ranked ahead of it under the rank_standings order, which is
+    cheaper than ranking everyone when only a couple of teams matter.
+    """
+    wins, points = final_wins[:, [team]], final_points[:, [team]]
+    ahead = (final_wins > wins) | ((final_wins == wins) & (final_points > points))
+    ahead[:, :team] |= (final_wins[:, :team] == wins) & (final_points[:, :team] == points)
+    return ahead.sum(axis=1) < playoff_spots
+
+def tally(model: SeasonModel, draw: SimulationDraw, playoff_spots: int = 4) -> SimulationTally:
+    """Rank all simulations at once and reduce them to seed, playoff and conditional counters."""
+    num_simulations, num_teams = draw.final_wins.shape
+    order = rank_standings(draw.final_wins, draw.final_points)
+    standings = np.empty_like(order)
+    np.put_along_axis(standings, order, np.arange(1, num_teams + 1), axis=1)
+
+    seed_counts = np.stack([np.bincount(order[:, seed], minlength=num_teams) for seed in range(playoff_spots)])
+    points_leader_counts = np.bincount(draw.final_points.argmax(axis=1), minlength=num_teams)
+
+    # P(playoffs | win/loss) is credited once per matchup key, so a pairing that repeats
+    # with the same home team counts only its last meeting
+    last_meeting = last_meetings(model)
+    home_won = draw.home_won[:, last_meeting]
+    winners = np.where(home_won, model.home[last_meeting], model.away[last_meeting])
+    losers = np.where(home_won, model.away[last_meeting], model.home[last_meeting])
+    made_playoffs = standings <= playoff_spots
+    winner_in = np.take_along_axis(made_playoffs, winners, axis=1)
+    loser_in = np.take_along_axis(made_playoffs, losers, axis=1)
+
+    game_wins = (draw.final_wins - model.current_wins).sum(axis=0)
+    game_losses = np.bincount(model.slot_teams, minlength=num_teams) * num_simulations - game_wins
+
+    return SimulationTally(
+        num_simulations=num_simulations,
+        standings=standings,
+        order=order,
+        seed_counts=seed_counts,
+        points_leader_counts=points_leader_counts,
+        playoff_given_win=np.bincount(winners[winner_in], minlength=num_teams),
+        playoff_given_loss=np.bincount(losers[loser_in], minlength=num_teams),
+        game_wins=game_wins,
+        game_losses=game_losses,
+        matchup_home_wins=draw.home_won.sum(axis=0),
+    )
+
+@dataclass
+class SimulationSample:
+    """
+    A uniform random sample of whole simulations, kept as bottom-k by random priority.
+
+    Keeping the k smallest priorities is order independent, so samples from separate
+    chunks merge into exactly the sample one pass would have kept. Rows are returned
+    in simulation order.
+    """
+    size: int
+    index: np.ndarray
+    priority: np.ndarray
+    final_wins: np.ndarray
+    final_points: np.ndarray
+    standings: np.ndarray
+    scores: np.ndarray
+    home_won: np.ndarray
+
+    ROW_FIELDS = ('index', 'priority', 'final_wins', 'final_points', 'standings', 'scores', 'home_won')
+
+    @classmethod
+    def empty(cls, model: SeasonModel, size: int) -> 'SimulationSample':
+        teams, games = model.num_teams, model.num_games
+        return cls(size=size, index=np.empty(0, np.int64), priority=np.empty(0),
+                   final_wins=np.empty((0, teams), np.int64), final_points=np.empty((0, teams)),
+                   standings=np.empty((0, teams), np.int64), scores=np.empty((0, 2 * games)),
+                   home_won=np.empty((0, games), bool))
+
+    def merge(self, other: 'SimulationSample'):
+        for name in self.ROW_FIELDS:
+            setattr(self, name, np.concatenate([getattr(self, name), getattr(other, name)]))
+        if len(self.index) > self.size:
+            keep = np.lexsort((self.index, self.priority))[:self.size]
+            keep.sort()
+            for name in self.ROW_FIELDS:
+                setattr(self, name, getattr(self, name)[keep])
+        order = np.argsort(self.index, kind='stable')
+        for name in self.ROW_FIELDS:
+            setattr(self, name, getattr(self, name)[order])
+
+class RawResultStore:
+    """Opt-in store of every simulation in compact dtypes (about 10x smaller than float64/int64 rows)."""
+    def __init__(self):
+        self.chunks = []
+
+    def append(self, draw: SimulationDraw, standings: np.ndarray):
+        self.chunks.append({
+            'final_wins': draw.final_wins.astype(np.int16),
+            'final_points': draw.final_points.astype(np.float32),
+            'standings': standings.astype(np.int8),
+            'scores': draw.scores.astype(np.float32),
+            'home_won': draw.home_won,
+        })
+
+    def merge(self, other: 'RawResultStore'):
+        self.chunks.extend(other.chunks)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Every stored field concatenated in simulation order."""
+        if not self.chunks:
+            return {}
+        return {name: np.concatenate([chunk[name] for chunk in self.chunks]) for name in self.chunks[0]}
+
+    def save(self, path: str):
+        np.savez(path, **self.arrays())
+
+def tracked_indicators(standings: np.ndarray, final_points: np.ndarray, playoff_spots: int) -> Dict[str, np.ndarray]:
+    """Per-simulation 0/1 outcomes behind SimulationAggregate.tracked_counts, simulations first."""
+    seeds = np.arange(1, playoff_spots + 1)
+    return {
+        'playoff': standings <= playoff_spots,
+        'seed': standings[:, None, :] == seeds[None, :, None],
+        'points_leader': final_points == final_points.max(axis=1, keepdims=True),
+    }
+
+@dataclass
+class AntitheticStats:
+    """Sum over antithetic pairs of (X_2k + X_2k+1)^2 for every tracked 0/1 outcome X."""
+    pairs: int
+    square_sums: Dict[str, np.ndarray]
+
+    @classmethod
+    def empty(cls, num_teams: int, playoff_spots: int) -> 'AntitheticStats':
+        zeros = lambda *shape: np.zeros(shape, dtype=np.int64)
+        return cls(pairs=0, square_sums={'playoff': zeros(num_teams), 'seed': zeros(playoff_spots, num_teams),
+                                         'points_leader': zeros(num_teams)})
+
+    @classmethod
+    def from_chunk(cls, standings: np.ndarray, final_points: np.ndarray, playoff_spots: int) -> 'AntitheticStats':
+        pairs = len(standings) // 2
+        square_sums = {}
+        for name, outcome in tracked_indicators(standings, final_points, playoff_spots).items():
+            pair_sums = outcome[0:2 * pairs:2].astype(np.int64) + outcome[1:2 * pairs:2]
+            square_sums[name] = (pair_sums ** 2).sum(axis=0)
+        return cls(pairs=pairs, square_sums=square_sums)
+
+    def merge(self, other: 'AntitheticStats'):
+        self.pairs += other.pairs
+        self.square_sums = {name: total + other.square_sums[name] for name, total in self.square_sums.items()}
+
+    def gain(self, name: str, p: np.ndarray) -> np.ndarray:
+        """
+        Variance of independent pairs over that of antithetic pairs, per outcome.
+
+        Equals the factor by which the simulations count as more, capped at
+        MAX_ANTITHETIC_GAIN. It is 1 until the outcome has both happened and not
+        happened MIN_ANTITHETIC_EVENTS times and the pair variance is positive, since an
+        early or rare-outcome estimate would overstate the gain and stop adaptive runs
+        too soon.
+        """
+        if self.pairs == 0:
+            return np.ones_like(p)
+        pair_mean_var = self.square_sums[name] / (4 * self.pairs) - p ** 2
+        independent_var = p * (1 - p) / 2
+        events = 2 * self.pairs * np.minimum(p, 1 - p)
+        estimable = (pair_mean_var > 0) & (events >= MIN_ANTITHETIC_EVENTS)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gain = np.where(estimable, independent_var / pair_mean_var, 1.0)
+        return np.clip(gain, 1 / MAX_ANTITHETIC_GAIN, MAX_ANTITHETIC_GAIN)
+
+@dataclass
+class ConditionalStats:
+    """
+    P(playoffs | win) and P(playoffs | loss) by common random numbers.
+
+    Every simulation is ranked twice per matchup (last meetings only), once in the
+    world where the home team wins it and once where the away team does, sharing all
+    other games. The forced result's scores are borrowed from a simulation of the same
+    chunk that really ended that way, so both worlds keep the right points-for
+    distribution. Index 0 of the world/side axes is the home team.
+    """
+    world_sims: np.ndarray    # (matchups, world) simulations ranked in each world
+    made_playoffs: np.ndarray  # (matchups, world, side) playoff finishes in each world
+    paired_sims: np.ndarray   # (matchups,) simulations ranked in both worlds
+    differ: np.ndarray        # (matchups, side) paired simulations where the result changed the outcome
+
+    @classmethod
+    def empty(cls, model: SeasonModel) -> 'ConditionalStats':
+        matchups = len(last_meetings(model))
+        zeros = lambda *shape: np.zeros(shape, dtype=np.int64)
+        return cls(world_sims=zeros(matchups, 2), made_playoffs=zeros(matchups, 2, 2),
+                   paired_sims=zeros(matchups), differ=zeros(matchups, 2))
+
+    @classmethod
+    def from_chunk(cls, model: SeasonModel, draw: SimulationDraw, standings: np.ndarray,
+                   playoff_spots: int) -> 'ConditionalStats':
+        """
+        Tally one chunk. Simulations that already ended the forced way keep their real
+        playoff outcome; only the others (the movers) are adjusted and re-ranked.
+        """
+        games = last_meetings(model)
+        stats = cls.empty(model)
+        world_sims, made_playoffs, paired_sims, differ = (stats.world_sims, stats.made_playoffs,
+                                                          stats.paired_sims, stats.differ)
+        actual = standings <= playoff_spots
+
+        for u, g in enumerate(games):
+            home, away = model.home[g], model.away[g]
+            outcomes = []
+            for world, home_wins in enumerate((True, False)):
+                donors = np.flatnonzero(draw.home_won[:, g] == home_wins)
+                if len(donors) == 0:
+                    outcomes.append(None)
+                    continue
+                movers = np.flatnonzero(draw.home_won[:, g] != home_wins)
+                borrowed = donors[np.arange(len(movers)) % len(donors)]
+                wins = draw.final_wins[movers]
+                points = draw.final_points[movers]
+                swing = 1 if home_wins else -1
+                wins[:, home] += swing
+                wins[:, away] -= swing
+                points[:, home] += draw.scores[borrowed, 2 * g] - draw.scores[movers, 2 * g]
+                points[:, away] += draw.scores[borrowed, 2 * g + 1] - draw.scores[movers, 2 * g + 1]
+
+                flags = actual[:, [home, away]].T.copy()
+                flags[0, movers] = in_playoffs(wins, points, home, playoff_spots)
+                flags[1, movers] = in_playoffs(wins, points, away, playoff_spots)
+                world_sims[u, world] = len(draw.final_wins)
+                made_playoffs[u, world] = flags.sum(axis=1)
+                outcomes.append(flags)
+
+            if outcomes[0] is not None and outcomes[1] is not None:
+                paired_sims[u] = len(draw.final_wins)
+                differ[u] = (outcomes[0] != outcomes[1]).sum(axis=1)
+
+        return stats
+
+    def merge(self, other: 'ConditionalStats'):
+        self.world_sims = self.world_sims + other.world_sims
+        self.made_playoffs = self.made_playoffs + other.made_playoffs
+        self.paired_sims = self.paired_sims + other.paired_sims
+        self.differ = self.differ + other.differ
+
+    def by_result(self):
+        """(matchups, side) P(playoffs | that side wins) and P(playoffs | that side loses)."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            p = self.made_playoffs / self.world_sims[:, :, None]
+        # The home side wins in world 0, the away side in world 1
+        given_win = np.stack([p[:, 0, 0], p[:, 1, 1]], axis=1)
+        given_loss = np.stack([p[:, 1, 0], p[:, 0, 1]], axis=1)
+        return np.nan_to_num(given_win), np.nan_to_num(given_loss)
+
+@dataclass
+class SimulationAggregate:
+    """
+    Fixed-size running totals over any number of simulations.
+
+    Counters, win and standing histograms and Welford/Chan points moments grow with
+    the number of teams, not simulations; only the sample (and the raw store, when
+    asked for) keep individual simulations. Aggregates of separate chunks merge.
+    """
+    num_simulations: int
+    seed_counts: np.ndarray
+    points_leader_counts: np.ndarray
+    playoff_given_win: np.ndarray
+    playoff_given_loss: np.ndarray
+    game_wins: np.ndarray
+    game_losses: np.ndarray
+    matchup_home_wins: np.ndarray
+    win_histogram: np.ndarray       # (teams, max possible wins + 1)
+    standing_histogram: np.ndarray  # (teams, teams), column s-1 counts finishes at standing s
+    points_mean: np.ndarray
+    points_m2: np.ndarray
+    sample: SimulationSample
+    raw: Optional[RawResultStore] = None
+    seed_entropy: Optional[int] = None
+    converged: Optional[bool] = None  # Adaptive runs: every tracked stderr reached the tolerance
+    elapsed_seconds: float = 0.0
+    antithetic: Optional[AntitheticStats] = None
+    conditional: Optional[ConditionalStats] = None
+
+    @classmethod
+    def empty(cls, model: SeasonModel, playoff_spots: int = 4, sample_size: int = SAMPLE_SIZE,
+              keep_raw: bool = False, antithetic: bool = False,
+              common_random_numbers: bool = False) -> 'SimulationAggregate':
+        teams = model.num_teams
+        max_wins = int((model.current_wins + np.bincount(model.slot_teams, minlength=teams)).max(initial=0))
+        zeros = lambda *shape: np.zeros(shape, dtype=np.int64)
+        return cls(num_simulations=0, seed_counts=zeros(playoff_spots, teams), points_leader_counts=zeros(teams),
+                   playoff_given_win=zeros(teams), playoff_given_loss=zeros(teams), game_wins=zeros(teams),
+                   game_losses=zeros(teams), matchup_home_wins=zeros(model.num_games),
+                   win_histogram=zeros(teams, max_wins + 1), standing_histogram=zeros(teams, teams),
+                   points_mean=np.zeros(teams), points_m2=np.zeros(teams),
+                   sample=SimulationSample.empty(model, sample_size),
+                   raw=RawResultStore() if keep_raw else None,
+                   antithetic=AntitheticStats.empty(teams, playoff_spots) if antithetic else None,
+                   conditional=ConditionalStats.empty(model) if common_random_numbers else None)
+
+    @property
+    def playoff_counts(self) -> np.ndarray:
+        return self.seed_counts.sum(axis=0)
+
+    def add(self, model: SeasonModel, draw: SimulationDraw, first_index: int = 0, priority: Optional[np.ndarray] = None):
+        """Fold one chunk of simulations (numbered from first_index) into the totals."""
+        counts = tally(model, draw, playoff_spots=len(self.seed_counts))
+        num_teams = model.num_teams
+        team_offsets = np.arange(num_teams)[:, None]
+        bins = self.win_histogram.shape[1]
+        index = np.arange(first_index, first_index + counts.num_simulations)
+        points_mean = draw.final_points.mean(axis=0)
+
+        chunk = SimulationAggregate(
+            num_simulations=counts.num_simulations,
+            seed_counts=counts.seed_counts,
+            points_leader_counts=counts.points_leader_counts,
+            playoff_given_win=counts.playoff_given_win,
+            playoff_given_loss=counts.playoff_given_loss,
+            game_wins=counts.game_wins,
+            game_losses=counts.game_losses,
+            matchup_home_wins=counts.matchup_home_wins,
+            win_histogram=np.bincount((team_offsets * bins + draw.final_wins.T).ravel(),
+                                      minlength=num_teams * bins).reshape(num_teams, bins),
+            standing_histogram=np.bincount((team_offsets * num_teams + counts.standings.T - 1).ravel(),
+                                           minlength=num_teams * num_teams).reshape(num_teams, num_teams),
+            points_mean=points_mean,
+            points_m2=((draw.final_points - points_mean) ** 2).sum(axis=0),
+            sample=SimulationSample(
+                size=self.sample.size, index=index,
+                priority=index.astype(np.float64) if priority is None else priority,
+                final_wins=draw.final_wins, final_points=draw.final_points, standings=counts.standings,
+                scores=draw.scores, home_won=draw.home_won),
+        )
+        if self.raw is not None:
+            chunk.raw = RawResultStore()
+            chunk.raw.append(draw, counts.standings)
+        if self.antithetic is not None:
+            chunk.antithetic = AntitheticStats.from_chunk(counts.standings, draw.final_points, len(self.seed_counts))
+        if self.conditional is not None:
+            chunk.conditional = ConditionalStats.from_chunk(model, draw, counts.standings, len(self.seed_counts))
+        self.merge(chunk)
+
+    def merge(self, other: 'SimulationAggregate'):
+        """Add another aggregate's simulations (numbered after this one's) to this one."""
+        n_a, n_b = self.num_simulations, other.num_simulations
+        if n_b == 0:
+            return
+        n = n_a + n_b
+        delta = other.points_mean - self.points_mean
+        self.points_mean = self.points_mean + delta * (n_b / n)
+        self.points_m2 = self.points_m2 + other.points_m2 + delta ** 2 * (n_a * n_b / n)
+        self.num_simulations = n
+
+        for name in ('seed_counts', 'points_leader_counts', 'playoff_given_win', 'playoff_given_loss',
+                     'game_wins', 'game_losses', 'matchup_home_wins', 'win_histogram', 'standing_histogram'):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.sample.merge(other.sample)
+        if self.raw is not None and other.raw is not None:
+            self.raw.merge(other.raw)
+        if self.antithetic is not None and other.antithetic is not None:
+            self.antithetic.merge(other.antithetic)
+        if self.conditional is not None and other.conditional is not None:
+            self.conditional.merge(other.conditional)
+
+    def tracked_counts(self) -> Dict[str, np.ndarray]:
+        """The probabilities adaptive runs converge on, as (seeds..., teams) counts."""
+        return {'playoff': self.playoff_counts, 'seed': self.seed_counts, 'points_leader': self.points_leader_counts}
+
+    def effective_simulations(self) -> Dict[str, np.ndarray]:
+        """What each tracked probability's simulations are worth as independent draws."""
+        n = max(self.num_simulations, 1)
+        effective = {}
+        for name, counts in self.tracked_counts().items():
+            gain = self.antithetic.gain(name, counts / n) if self.antithetic is not None else np.ones(counts.shape)
+            effective[name] = n * gain
+        return effective
+
+    def max_stderr(self, z: float = CONFIDENCE_Z) -> float:
+        """Largest standard error across every tracked probability."""
+        if self.num_simulations == 0:
+            return float('inf')
+        effective = self.effective_simulations()
+        return max(float(proportion_stderr(counts * effective[name] / self.num_simulations,
+                                           effective[name], z).max(initial=0))
+                   for name, counts in self.tracked_counts().items())
+
+    def intervals(self, z: float = CONFIDENCE_Z) -> Dict[str, tuple]:
+        """95% (by default) Wilson intervals for every tracked probability, as fractions."""
+        effective = self.effective_simulations()
+        n = max(self.num_simulations, 1)
+        return {name: proportion_interval(counts * effective[name] / n, effective[name], z)
+                for name, counts in self.tracked_counts().items()}
+
+    def playoff_given_result(self, model: SeasonModel):
+        """
+        Per-team P(playoffs | win) and P(playoffs | loss) of a remaining game, as fractions.
+
+        With common random numbers each matchup's conditional odds are weighted by the
+        chance of that result; otherwise they are the plain ratios of the counters.
+        """
+        if self.conditional is None:
+            return (self.playoff_given_win / np.maximum(self.game_wins, 1),
+                    self.playoff_given_loss / np.maximum(self.game_losses, 1))
+
+        games = last_meetings(model)
+        given_win, given_loss = self.conditional.by_result()
+        home_win = self.matchup_home_wins[games] / max(self.num_simulations, 1)
+        win_chance = np.stack([home_win, 1 - home_win], axis=1)
+        teams = np.stack([model.home[games], model.away[games]], axis=1).ravel()
+
+        def pooled(odds, weights):
+            total = np.bincount(teams, weights=weights.ravel(), minlength=model.num_teams)
+            return np.bincount(teams, weights=(odds * weights).ravel(), minlength=model.num_teams) / np.maximum(total, 1e-12)
+
+        return pooled(given_win, win_chance), pooled(given_loss, 1 - win_chance)
+
+    def variance_reduction_report(self, model: SeasonModel) -> Dict[str, Any]:
+        """
+        Median effective-sample-size gains of the variance reduction in use.
+
+        antithetic: over every playoff/seed/PF-leader probability still in doubt.
+        common_random_numbers: for the swing P(playoffs | win) - P(playoffs | loss) of
+        each matchup side, against estimating both from the simulations that happened
+        to end each way.
+        """
+        report = {'simulations': self.num_simulations}
+        if self.antithetic is not None:
+            n = max(self.num_simulations, 1)
+            gains = [self.antithetic.gain(name, counts / n)[(counts > 0) & (counts < n)]
+                     for name, counts in self.tracked_counts().items()]
+            gains = np.concatenate([gain.ravel() for gain in gains])
+            report['antithetic_gain'] = float(np.median(gains)) if len(gains) else 1.0
+            report['effective_simulations'] = int(self.num_simulations * report['antithetic_gain'])
+        if self.conditional is not None:
+            conditional = self.conditional
+            games = last_meetings(model)
+            given_win, given_loss = conditional.by_result()
+            home_win = self.matchup_home_wins[games] / max(self.num_simulations, 1)
+            win_chance = np.stack([home_win, 1 - home_win], axis=1)
+            paired = np.maximum(conditional.paired_sims, 1)[:, None]
+
+            swing = given_win - given_loss
+            crn_var = (conditional.differ / paired - swing ** 2) / paired
+            with np.errstate(divide='ignore', invalid='ignore'):
+                naive_var = (given_win * (1 - given_win) / (paired * win_chance)
+                             + given_loss * (1 - given_loss) / (paired * (1 - win_chance)))
+                gains = naive_var / crn_var
+            usable = (crn_var > 0) & np.isfinite(gains) & (conditional.paired_sims[:, None] > 0)
+            report['common_random_numbers_gain'] = float(np.median(gains[usable])) if usable.any() else 1.0
+        return report
+
+    def wins_mean(self) -> np.ndarray:
+        return self.win_histogram @ np.arange(self.win_histogram.shape[1]) / max(self.num_simulations, 1)
+
+    def wins_std(self) -> np.ndarray:
+        values = np.arange(self.win_histogram.shape[1])
+        variance = self.win_histogram @ values ** 2 / max(self.num_simulations, 1) - self.wins_mean() ** 2
+        return np.sqrt(np.maximum(variance, 0))
+
+    def wins_mode(self) -> np.ndarray:
+        """Most frequent final win total (the smallest one on a tie)."""
+        return self.win_histogram.argmax(axis=1)
+
+    def avg_standing(self) -> np.ndarray:
+        return self.standing_histogram @ np.arange(1, self.standing_histogram.shape[1] + 1) / max(self.num_simulations, 1)
+
+    def points_std(self) -> np.ndarray:
+        return np.sqrt(self.points_m2 / max(self.num_simulations, 1))
+
+def proportion_stderr(counts: np.ndarray, n: int, z: float = CONFIDENCE_Z) -> np.ndarray:
+    """
+    Standard error of count/n, using the Agresti-Coull adjusted proportion.
+
+    The adjustment keeps a probability that has come out 0 or 1 so far from
+    claiming zero error after a handful of simulations.
+    """
+    n_adj = n + z ** 2
+    p_adj = (np.asarray(counts) + z ** 2 / 2) / n_adj
+    return np.sqrt(p_adj * (1 - p_adj) / n_adj)
+
+def proportion_interval(counts: np.ndarray, n, z: float = CONFIDENCE_Z):
+    """Wilson score interval (lower, upper) for count/n; n may be a per-count array of effective sizes."""
+    n = np.maximum(n, 1)
+    p = np.asarray(counts) / n
+    denominator = 1 + z ** 2 / n
+    center = (p + z ** 2 / (2 * n)) / denominator
+    half_width = z * np.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / denominator
+    return np.clip(center - half_width, 0, 1), np.clip(center + half_width, 0, 1)
+
+def _run_chunk(model: SeasonModel, first_index: int, size: int, seed: np.random.SeedSequence,
+               playoff_spots: int, sample_size: int, keep_raw: bool, antithetic: bool = False,
+               common_random_numbers: bool = False) -> SimulationAggregate:
+    """Simulate one chunk with its own generator; module level so a process pool can pickle it."""
+    rng = np.random.default_rng(seed)
+    draw = simulate(model, size, rng, antithetic)
+    priority = rng.random(size)
+
+    aggregate = SimulationAggregate.empty(model, playoff_spots, sample_size, keep_raw, antithetic, common_random_numbers)
+    aggregate.add(model, draw, first_index, priority)
+    return aggregate
+
+def _simulate_batch(aggregate: SimulationAggregate, model: SeasonModel, seed_sequence: np.random.SeedSequence,
+                    size: int, chunk_size: int, executor: Optional[ProcessPoolExecutor], keep_raw: bool):
+    """
+    Simulate `size` more seasons into aggregate, in chunks of up to chunk_size.
+
+    Batches are split into at least MIN_CHUNKS chunks (of at least MIN_CHUNK_SIZE), so
+    a batch big enough for the pool spreads over every worker. Chunking depends only
+    on the batch size, never on the worker count, and chunks are even so no antithetic
+    pair straddles two generators. Chunk seeds are spawned from seed_sequence in order.
+    """
+    antithetic = aggregate.antithetic is not None
+    chunk_size = min(chunk_size, max(MIN_CHUNK_SIZE, -(-size // MIN_CHUNKS)))
+    chunk_size += chunk_size % 2
+    first = aggregate.num_simulations
+    starts = list(range(first, first + size, chunk_size))
+    chunk_args = [(model, start, min(chunk_size, first + size - start), chunk_seed, len(aggregate.seed_counts),
+                   aggregate.sample.size, keep_raw, antithetic, aggregate.conditional is not None)
+                  for start, chunk_seed in zip(starts, seed_sequence.spawn(len(starts)))]
+
+    if executor is not None and len(chunk_args) > 1:
+        chunks = executor.map(_run_chunk, *zip(*chunk_args))
+    else:
+        chunks = (_run_chunk(*args) for args in chunk_args)
+    for chunk in chunks:
+        aggregate.merge(chunk)
+
+def _executor(workers: int, size: int) -> Optional[ProcessPoolExecutor]:
+    # Each spawned worker re-imports the caller's main module (pandas, matplotlib... for
+    # team_analysis), which costs more than simulating a few hundred thousand seasons inline
+    if workers <= 1 or size < MIN_POOL_SIMULATIONS:
+        return None
+    # spawn: workers never inherit the caller's threads
+    return ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'))
+
+def run_simulations(model: SeasonModel, num_simulations: int, seed=None, workers: int = 1,
+                    playoff_spots: int = 4, chunk_size: int = CHUNK_SIZE, sample_size: int = SAMPLE_SIZE,
+                    keep_raw: bool = False, antithetic: bool = False,
+                    common_random_numbers: bool = False) -> SimulationAggregate:
+    """
+    Simulate num_simulations seasons chunk by chunk into a SimulationAggregate.
+
+    Every chunk draws from its own generator spawned from one SeedSequence(seed), and
+    chunk boundaries depend only on num_simulations and chunk_size. Partial aggregates
+    are merged in chunk order, so a given seed gives bit-identical results whether the
+    chunks run inline or on a process pool of any size. The pool only starts for runs of
+    at least MIN_POOL_SIMULATIONS, below which its startup outweighs it. seed=None draws
+    fresh entropy; the aggregate's seed_entropy records it for reruns.
+
+    Peak memory is one chunk per worker plus the sample, however many simulations run.
+
+    antithetic draws seasons in mirrored pairs and common_random_numbers re-ranks each
+    simulation with every matchup forced both ways (see AntitheticStats and
+    ConditionalStats); aggregate.variance_reduction_report() says what they bought.
+    """
+    started = time.perf_counter()
+    seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    aggregate = SimulationAggregate.empty(model, playoff_spots, sample_size, keep_raw, antithetic,
+                                          common_random_numbers)
+
+    executor = _executor(workers, num_simulations)
+    try:
+        _simulate_batch(aggregate, model, seed_sequence, num_simulations, chunk_size, executor, keep_raw)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    aggregate.seed_entropy = seed_sequence.entropy
+    aggregate.elapsed_seconds = time.perf_counter() - started
+    return aggregate
+
+def run_adaptive(model: SeasonModel, tolerance: float, max_simulations: int, time_budget: Optional[float] = None,
+                 seed=None, workers: int = 1, playoff_spots: int = 4, chunk_size: int = CHUNK_SIZE,
+                 sample_size: int = SAMPLE_SIZE, min_simulations: int = ADAPTIVE_MIN_SIMULATIONS,
+                 keep_raw: bool = False, antithetic: bool = False,
+                 common_random_numbers: bool = False) -> SimulationAggregate:
+    """
+    Simulate in batches until every playoff, seed and PF-leader probability has a
+    standard error at or below tolerance, max_simulations is reached, or time_budget
+    seconds have passed.
+
+    Standard errors shrink as 1/sqrt(n), so each batch is sized to what the current
+    worst one says is still needed (at most doubling the total). Decided odds (near
+    0% or 100%) converge after the first batch, so late-season runs stop early. Batch
+    sizes depend only on the results so far, so for a given seed a run stopped by the
+    tolerance is bit-identical for any worker count; aggregate.converged records why
+    it stopped. With antithetic draws the standard errors use the effective sample
+    size, so the same tolerance is met with fewer simulations. The process pool starts
+    with the first batch of at least MIN_POOL_SIMULATIONS, if one comes.
+    """
+    started = time.perf_counter()
+    seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    aggregate = SimulationAggregate.empty(model, playoff_spots, sample_size, keep_raw, antithetic,
+                                          common_random_numbers)
+    batch = min(min_simulations, max_simulations)
+
+    executor = None
+    try:
+        while batch > 0:
+            executor = executor or _executor(workers, batch)
+            _simulate_batch(aggregate, model, seed_sequence, batch, chunk_size, executor, keep_raw)
+            stderr = aggregate.max_stderr()
+            aggregate.converged = stderr <= tolerance
+            if aggregate.converged:
+                break
+            if time_budget is not None and time.perf_counter() - started >= time_budget:
+                break
+
+            n = aggregate.num_simulations
+            needed = int(np.ceil(n * (stderr / tolerance) ** 2)) - n
+            batch = min(max(needed, min_simulations), n, max_simulations - n)
+            batch += batch % 2 if antithetic and batch < max_simulations - n else 0
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    aggregate.seed_entropy = seed_sequence.entropy
+    aggregate.elapsed_seconds = time.perf_counter() - started
+    return aggregate
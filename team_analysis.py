@@ -11,9 +11,15 @@ import seaborn as sns
 import numpy as np
 from pathlib import Path
 import os
-import requests
 from datetime import datetime
+from functools import lru_cache
 from espn_api import ESPNFantasyAPI
+from response_cache import ResponseCache
+from parquet_store import MISSING_PYARROW, ParquetStore
+from config import PARQUET_DIR
+from schema import compact_frame
+from simulation_engine import build_season_model, run_adaptive, run_simulations
+from win_distribution import playoff_bounds, win_distribution
 
 sns.set_style("whitegrid")
 plt.rcParams['figure.facecolor'] = 'white'
@@ -22,35 +28,68 @@ plt.rcParams['axes.facecolor'] = 'white'
 LEAGUE_ID = 149388
 CURRENT_SEASON = 2025
 NUM_SIMULATIONS = 10000
+SIMULATION_SEED = None  # Set an int to reproduce a run's odds exactly (for any SIMULATION_WORKERS)
+SIMULATION_WORKERS = os.cpu_count() or 1  # Only used for runs of simulation_engine.MIN_POOL_SIMULATIONS or more
+SIMULATION_TOLERANCE = None  # e.g. 0.0025: simulate until every playoff/seed/PF-leader stderr is below this
+SIMULATION_TIME_BUDGET = 120  # Seconds an adaptive run may take before stopping with what it has
+MAX_SIMULATIONS = 1000000  # Upper bound for adaptive runs
+ANTITHETIC_DRAWS = False  # Simulate seasons in mirrored pairs (tighter playoff odds for the same count)
+COMMON_RANDOM_NUMBERS = False  # Re-rank each simulation with every matchup forced both ways (tighter given-win/loss odds)
 ESPN_PROJECTION_WEIGHT = 0.6
 HISTORICAL_WEIGHT = 0.4
 
-def load_data(filename='team_stats.csv'):
-    """Load team stats from CSV."""
+def load_table(table, filename):
+    """Load a scraper table from its Parquet dataset when that is newer than the CSV, else the CSV."""
+    output_dir = os.path.dirname(filename) or '.'
+    if os.path.isdir(os.path.join(output_dir, PARQUET_DIR)):
+        if not ParquetStore.available():
+            if not os.path.exists(filename):
+                raise ImportError(MISSING_PYARROW)
+        else:
+            store = ParquetStore(output_dir)
+            parquet_mtime = store.last_modified(table)
+            if parquet_mtime is not None and (not os.path.exists(filename) or
+                                              parquet_mtime >= os.path.getmtime(filename)):
+                return store.read_table(table)
     return pd.read_csv(filename)
 
-def load_matchups(filename='matchups.csv'):
-    """Load matchups from CSV."""
-    return pd.read_csv(filename)
+def load_data(filename='team_stats.csv'):
+    """Load team stats from the Parquet dataset or CSV, with compact dtypes."""
+    return compact_frame(load_table('team_stats', filename))
 
+def load_matchups(filename='matchups.csv'):
+    """Load matchups from the Parquet dataset or CSV, with compact dtypes."""
+    return compact_frame(load_table('matchups', filename))
+
+def configure_league(league_id, season, simulation_workers=None):
+    """Point the analysis at another league and season (see batch_runner.py)."""
+    global LEAGUE_ID, CURRENT_SEASON, SIMULATION_WORKERS
+    LEAGUE_ID = league_id
+    CURRENT_SEASON = season
+    if simulation_workers is not None:
+        SIMULATION_WORKERS = simulation_workers
+    get_espn_api.cache_clear()
+
+@lru_cache(maxsize=None)
 def get_espn_api():
-    """Initialize ESPN API with credentials."""
+    """
+    Initialize ESPN API with credentials (one shared, pooled client per run).
+    
+    League status is loaded up front so completed weeks (or a completed season) are
+    cached as final instead of being refetched once the cache TTL runs out.
+    """
     swid = os.environ.get('SWID', '')
     espn_s2 = os.environ.get('ESPN_S2', '')
-    return ESPNFantasyAPI(LEAGUE_ID, CURRENT_SEASON, espn_s2, swid)
+    api = ESPNFantasyAPI(LEAGUE_ID, CURRENT_SEASON, espn_s2, swid, cache=ResponseCache())
+    api.get_league_data()
+    return api
 
 def get_remaining_schedule():
     """Fetch remaining schedule from ESPN API."""
-    swid = os.environ.get('SWID', '')
-    espn_s2 = os.environ.get('ESPN_S2', '')
-    cookies = {'swid': swid, 'espn_s2': espn_s2}
-    
-    url = f'https://lm-api-reads.fantasy.espn.com/apis/v3/games/ffl/seasons/{CURRENT_SEASON}/segments/0/leagues/{LEAGUE_ID}'
-    params = {'view': ['mTeam', 'mMatchupScore', 'mSettings']}
-    
     try:
-        r = requests.get(url, cookies=cookies, params=params)
-        data = r.json()
+        data = get_espn_api().get_schedule_and_settings()
+        if data is None:
+            raise ValueError("no schedule data returned")
         
         teams = {t['id']: t.get('abbrev', f'Team{t["id"]}') for t in data.get('teams', [])}
         
@@ -80,7 +119,7 @@ def get_remaining_schedule():
 
 def calculate_summary_stats(df):
     """Calculate season summary statistics including WAX."""
-    summary = df.groupby(['team_name', 'season']).agg({
+    summary = df.groupby(['team_name', 'season'], observed=True).agg({
         'wins': 'sum',
         'mvp_w': 'sum',
         'top6_wins': 'sum',
@@ -89,13 +128,20 @@ def calculate_summary_stats(df):
         'weekly_rank': 'mean'
     }).reset_index()
     
+    # df may hold compact float32 points (see schema.COMPACT_TYPES); totals of 2-decimal
+    # scores and 4-decimal mvp_w are rounded back to exact float64 values
+    summary['points_for'] = summary['points_for'].astype('float64').round(2)
+    summary['points_against'] = summary['points_against'].astype('float64').round(2)
+    summary['mvp_w'] = summary['mvp_w'].astype('float64').round(4)
+    
     summary['wax'] = summary['wins'] - summary['mvp_w']
     
-    weeks_played = df.groupby(['team_name', 'season']).size().reset_index(name='games_played')
+    weeks_played = df.groupby(['team_name', 'season'], observed=True).size().reset_index(name='games_played')
     summary = summary.merge(weeks_played, on=['team_name', 'season'])
     summary['ppg'] = summary['points_for'] / summary['games_played']
     summary['papg'] = summary['points_against'] / summary['games_played']
-    summary['points_std'] = df.groupby(['team_name', 'season'])['points_for'].std().values
+    summary['points_std'] = df['points_for'].astype('float64').round(2).groupby(
+        [df['team_name'], df['season']], observed=True).std().values
     
     summary = summary.rename(columns={
         'wins': 'real_wins',
@@ -881,21 +927,30 @@ def fetch_espn_projections(remaining_schedule):
     remaining_weeks = sorted(set(g['week'] for g in remaining_schedule))
     current_week = min(remaining_weeks) if remaining_weeks else 13
     
-    print(f"  Fetching ESPN projections for weeks {remaining_weeks}...")
-    projections = api.get_weekly_projections(remaining_weeks)
+    print(f"  Fetching roster snapshots for weeks {remaining_weeks}...")
+    snapshots = {}
+    for week in remaining_weeks:
+        snapshot = api.get_roster_snapshot(week)
+        if snapshot is not None:
+            snapshots[week] = snapshot
+    
+    print(f"  Calculating ESPN projections...")
+    projections = api.get_weekly_projections(remaining_weeks, snapshots)
     
-    print(f"  Fetching enhanced roster health (starters + bench studs)...")
-    roster_health = api.get_enhanced_roster_health(current_week)
+    print(f"  Calculating enhanced roster health (starters + bench studs)...")
+    roster_health = api.get_enhanced_roster_health(current_week, snapshots.get(current_week))
     
     print(f"  Calculating optimized lineup projections (BYE week + injury substitutions)...")
     optimized_lineups = {}
     for week in remaining_weeks:
-        optimized_lineups[week] = api.get_optimized_lineup_projections(week)
+        optimized_lineups[week] = api.get_optimized_lineup_projections(week, snapshots.get(week))
     
     return projections, roster_health, optimized_lineups
 
 def monte_carlo_playoff_simulation(summary, remaining_schedule, espn_projections, roster_health, 
-                                   optimized_lineups=None, num_simulations=NUM_SIMULATIONS):
+                                   optimized_lineups=None, num_simulations=NUM_SIMULATIONS, keep_raw=False,
+                                   seed=SIMULATION_SEED, workers=None, tolerance=SIMULATION_TOLERANCE,
+                                   antithetic=ANTITHETIC_DRAWS, common_random_numbers=COMMON_RANDOM_NUMBERS):
     """
     Run Monte Carlo simulation with optimized lineup projections, blending ESPN projections 
     with historical performance and accounting for BYE week / injury substitutions.
@@ -911,9 +966,40 @@ def monte_carlo_playoff_simulation(summary, remaining_schedule, espn_projections
     - Returning player projections
     
     Tracks both wins AND total points for tiebreaker analysis.
+    
+    Simulations are aggregated as they run (see simulation_engine.SimulationAggregate), so
+    memory stays flat for any num_simulations. The per-team distributions and
+    simulation_results hold a random sample of at most SAMPLE_SIZE simulations;
+    keep_raw=True also returns every simulation as compact arrays in
+    _simulation_meta['raw_results'].
+    
+    Chunks run on `workers` processes (default SIMULATION_WORKERS) once a run is large
+    enough to pay for the pool's startup; the same seed gives identical odds for any
+    worker count, and _simulation_meta['seed'] records the entropy of unseeded runs.
+    
+    With a tolerance the run is adaptive: it simulates in batches until every playoff, seed
+    and PF-leader standard error is below tolerance (or MAX_SIMULATIONS /
+    SIMULATION_TIME_BUDGET is hit), and num_simulations is ignored. Every probability
+    comes with a 95% Wilson interval (e.g. playoff_pct_ci) either way.
+    
+    antithetic and common_random_numbers switch on the engine's variance reduction;
+    the intervals account for it, and _simulation_meta['variance_reduction'] reports
+    the effective-sample-size gains.
+    
+    Win totals (wins_mean/std/mode, exact_win_distribution) come from the exact
+    Poisson-binomial engine in win_distribution.py rather than the simulations. The
+    same engine bounds every playoff_pct (playoff_pct_bounds, clinched, eliminated).
+    The full simulation still runs, since seeds and the PF race need it. Its playoff_pct
+    and interval are then clipped into the exact bounds, and the seed odds are rescaled
+    by the same factor so they still add up to playoff_pct. Only the part that depends
+    on the other results and tiebreakers therefore carries simulation noise. Clinched
+    and eliminated teams already match the bounds in every simulation, so clipping
+    only ever moves a bubble estimate that sampling noise pushed past a bound.
     """
     if optimized_lineups is None:
         optimized_lineups = {}
+    if workers is None:
+        workers = SIMULATION_WORKERS
     
     current_summary = summary[summary['season'] == CURRENT_SEASON].copy()
     
@@ -939,31 +1025,6 @@ def monte_carlo_playoff_simulation(summary, remaining_schedule, espn_projections
             team_stats[team]['optimization_moves'] = []
             team_stats[team]['total_optimization_gain'] = 0.0
     
-    win_distributions = {team: [] for team in team_stats.keys()}
-    points_distributions = {team: [] for team in team_stats.keys()}
-    standing_distributions = {team: [] for team in team_stats.keys()}
-    playoff_counts = {team: 0 for team in team_stats.keys()}
-    championship_counts = {team: 0 for team in team_stats.keys()}
-    second_place_counts = {team: 0 for team in team_stats.keys()}
-    third_place_counts = {team: 0 for team in team_stats.keys()}
-    fourth_place_counts = {team: 0 for team in team_stats.keys()}
-    points_for_leader_counts = {team: 0 for team in team_stats.keys()}
-    
-    matchup_wins = {}
-    playoff_given_win = {team: 0 for team in team_stats.keys()}
-    playoff_given_loss = {team: 0 for team in team_stats.keys()}
-    wins_count = {team: 0 for team in team_stats.keys()}
-    losses_count = {team: 0 for team in team_stats.keys()}
-    week15_scores = {team: [] for team in team_stats.keys()}
-    simulation_results = []
-    
-    games_by_week = {}
-    for game in remaining_schedule:
-        week = game['week']
-        if week not in games_by_week:
-            games_by_week[week] = []
-        games_by_week[week].append(game)
-    
     all_optimization_moves = {team: [] for team in team_stats.keys()}
     all_optimization_gains = {team: 0.0 for team in team_stats.keys()}
     
@@ -973,9 +1034,8 @@ def monte_carlo_playoff_simulation(summary, remaining_schedule, espn_projections
     bye_players_all = {team: [] for team in team_stats.keys()}
     unavailable_starters_all = {team: [] for team in team_stats.keys()}
     
-    for week in games_by_week.keys():
+    for week in dict.fromkeys(game['week'] for game in remaining_schedule):
         week_opt = optimized_lineups.get(week, {})
-        week_proj = espn_projections.get(week, {})
         
         for team in team_stats.keys():
             if team in week_opt:
@@ -998,123 +1058,70 @@ def monte_carlo_playoff_simulation(summary, remaining_schedule, espn_projections
                     move['week'] = week
                     all_optimization_moves[team].append(move)
     
-    for sim in range(num_simulations):
-        sim_wins = {team: stats['wins'] for team, stats in team_stats.items()}
-        sim_points = {team: stats['points_for'] for team, stats in team_stats.items()}
-        sim_week15_scores = {}
-        sim_matchup_winners = {}
-        
-        for week, games in games_by_week.items():
-            week_projections = espn_projections.get(week, {})
-            week_opt = optimized_lineups.get(week, {})
-            
-            for game in games:
-                home = game['home']
-                away = game['away']
-                if home not in team_stats or away not in team_stats:
-                    continue
-                
-                for team, opponent in [(home, away), (away, home)]:
-                    stats = team_stats[team]
-                    
-                    opt_data = week_opt.get(team, {})
-                    optimized_proj = opt_data.get('optimized_projection', None)
-                    espn_proj = week_projections.get(team, {}).get('projected_points', None)
-                    
-                    if optimized_proj and optimized_proj > 0:
-                        expected = (ESPN_PROJECTION_WEIGHT * optimized_proj) + (HISTORICAL_WEIGHT * stats['ppg'])
-                    elif espn_proj and espn_proj > 0:
-                        expected = (ESPN_PROJECTION_WEIGHT * espn_proj) + (HISTORICAL_WEIGHT * stats['ppg'])
-                    else:
-                        expected = stats['ppg']
-                    
-                    base_std = stats['std']
-                    variance_mult = stats.get('variance_multiplier', 1.0)
-                    
-                    opt_confidence = opt_data.get('confidence', 1.0)
-                    confidence_factor = 1.0 + (1.0 - opt_confidence) * 0.3
-                    adjusted_std = base_std * variance_mult * confidence_factor
-                    
-                    if team == home:
-                        home_score = max(50, np.random.normal(expected, adjusted_std))
-                    else:
-                        away_score = max(50, np.random.normal(expected, adjusted_std))
-                
-                sim_points[home] += home_score
-                sim_points[away] += away_score
-                sim_week15_scores[home] = home_score
-                sim_week15_scores[away] = away_score
-                week15_scores[home].append(home_score)
-                week15_scores[away].append(away_score)
-                
-                matchup_key = f"{home}_vs_{away}"
-                if matchup_key not in matchup_wins:
-                    matchup_wins[matchup_key] = {'home': home, 'away': away, 'home_wins': 0, 'away_wins': 0}
-                
-                if home_score > away_score:
-                    sim_wins[home] += 1
-                    sim_matchup_winners[matchup_key] = home
-                    matchup_wins[matchup_key]['home_wins'] += 1
-                    wins_count[home] += 1
-                    losses_count[away] += 1
-                else:
-                    sim_wins[away] += 1
-                    sim_matchup_winners[matchup_key] = away
-                    matchup_wins[matchup_key]['away_wins'] += 1
-                    wins_count[away] += 1
-                    losses_count[home] += 1
-        
-        standings = sorted(team_stats.keys(), 
-                          key=lambda t: (sim_wins[t], sim_points[t]), 
-                          reverse=True)
-        
-        playoff_teams = set(standings[:4])
-        for rank, team in enumerate(standings, 1):
-            win_distributions[team].append(sim_wins[team])
-            points_distributions[team].append(sim_points[team])
-            standing_distributions[team].append(rank)
-            if rank <= 4:
-                playoff_counts[team] += 1
-                if rank == 1:
-                    championship_counts[team] += 1
-                elif rank == 2:
-                    second_place_counts[team] += 1
-                elif rank == 3:
-                    third_place_counts[team] += 1
-                elif rank == 4:
-                    fourth_place_counts[team] += 1
-        
-        for matchup_key, winner in sim_matchup_winners.items():
-            matchup = matchup_wins[matchup_key]
-            home, away = matchup['home'], matchup['away']
-            if winner == home:
-                if home in playoff_teams:
-                    playoff_given_win[home] += 1
-                if away in playoff_teams:
-                    playoff_given_loss[away] += 1
-            else:
-                if away in playoff_teams:
-                    playoff_given_win[away] += 1
-                if home in playoff_teams:
-                    playoff_given_loss[home] += 1
-        
+    model = build_season_model(team_stats, remaining_schedule, espn_projections, optimized_lineups,
+                               ESPN_PROJECTION_WEIGHT, HISTORICAL_WEIGHT)
+    exact_wins = win_distribution(model)
+    bounds = playoff_bounds(model)
+    playoff_floor, playoff_ceiling = bounds.playoff_probability(exact_wins)
+    
+    if tolerance:
+        aggregate = run_adaptive(model, tolerance, MAX_SIMULATIONS, SIMULATION_TIME_BUDGET,
+                                 seed=seed, workers=workers, keep_raw=keep_raw, antithetic=antithetic,
+                                 common_random_numbers=common_random_numbers)
+        num_simulations = aggregate.num_simulations
+    else:
+        aggregate = run_simulations(model, num_simulations, seed=seed, workers=workers, keep_raw=keep_raw,
+                                    antithetic=antithetic, common_random_numbers=common_random_numbers)
+    sample = aggregate.sample
+    teams = model.teams
+    matchup_keys = model.matchup_keys()
+    
+    matchup_wins = {}
+    for g, matchup_key in enumerate(matchup_keys):
+        if matchup_key not in matchup_wins:
+            matchup_wins[matchup_key] = {'home': teams[model.home[g]], 'away': teams[model.away[g]], 'home_wins': 0, 'away_wins': 0}
+        home_wins = int(aggregate.matchup_home_wins[g])
+        matchup_wins[matchup_key]['home_wins'] += home_wins
+        matchup_wins[matchup_key]['away_wins'] += num_simulations - home_wins
+    
+    slot_teams = [teams[t] for t in model.slot_teams]
+    sample_top4 = np.argsort(sample.standings, axis=1)[:, :4]
+    simulation_results = []
+    for row in range(len(sample.index)):
         simulation_results.append({
-            'standings': standings[:4],
-            'matchup_winners': sim_matchup_winners.copy(),
-            'final_wins': sim_wins.copy(),
-            'final_pf': sim_points.copy(),
-            'week15_scores': sim_week15_scores.copy()
+            'standings': [teams[t] for t in sample_top4[row]],
+            'matchup_winners': {key: teams[model.home[g]] if sample.home_won[row, g] else teams[model.away[g]]
+                                for g, key in enumerate(matchup_keys)},
+            'final_wins': dict(zip(teams, sample.final_wins[row].tolist())),
+            'final_pf': dict(zip(teams, sample.final_points[row].tolist())),
+            'week15_scores': dict(zip(slot_teams, sample.scores[row].tolist()))
         })
-        
-        pf_leader = max(team_stats.keys(), key=lambda t: sim_points[t])
-        points_for_leader_counts[pf_leader] += 1
+    
+    wins_mean = exact_wins.mean()
+    wins_std = exact_wins.std()
+    wins_mode = exact_wins.mode()
+    final_wins = exact_wins.final_wins()
+    avg_standing = aggregate.avg_standing()
+    points_std = aggregate.points_std()
+    
+    playoff_given_win, playoff_given_loss = aggregate.playoff_given_result(model)
+    
+    def interval_pct(interval):
+        low, high = interval
+        return list(zip((low * 100).tolist(), (high * 100).tolist()))
+    
+    intervals = aggregate.intervals()
+    simulated_playoff = aggregate.playoff_counts / num_simulations
+    playoff_pct = np.clip(simulated_playoff, playoff_floor, playoff_ceiling) * 100
+    playoff_ci = interval_pct(np.clip(intervals['playoff'], playoff_floor, playoff_ceiling))
+    seed_scale = np.divide(playoff_pct / 100, simulated_playoff, out=np.zeros(len(teams)), where=simulated_playoff > 0)
+    seed_pct = aggregate.seed_counts / num_simulations * seed_scale * 100
+    seed_ci = [interval_pct((np.minimum(low * seed_scale, 1), np.minimum(high * seed_scale, 1)))
+               for low, high in zip(*intervals['seed'])]
+    points_leader_ci = interval_pct(intervals['points_leader'])
     
     results = {}
-    for team in team_stats.keys():
-        wins_array = np.array(win_distributions[team])
-        points_array = np.array(points_distributions[team])
-        standings_array = np.array(standing_distributions[team])
-        
+    for i, team in enumerate(teams):
         weeks_count = max(projection_weeks.get(team, 1), 1)
         avg_espn_proj = espn_proj_totals.get(team, 0) / weeks_count
         avg_optimized_proj = optimized_proj_totals.get(team, 0) / weeks_count
@@ -1123,22 +1130,22 @@ def monte_carlo_playoff_simulation(summary, remaining_schedule, espn_projections
         blended_proj = (ESPN_PROJECTION_WEIGHT * avg_optimized_proj) + (HISTORICAL_WEIGHT * historical_ppg)
         
         results[team] = {
-            'playoff_pct': (playoff_counts[team] / num_simulations) * 100,
-            'avg_standing': standings_array.mean(),
-            'championship_pct': (championship_counts[team] / num_simulations) * 100,
-            'second_place_pct': (second_place_counts[team] / num_simulations) * 100,
-            'third_place_pct': (third_place_counts[team] / num_simulations) * 100,
-            'points_for_leader_pct': (points_for_leader_counts[team] / num_simulations) * 100,
+            'playoff_pct': playoff_pct[i],
+            'avg_standing': avg_standing[i],
+            'championship_pct': seed_pct[0, i],
+            'second_place_pct': seed_pct[1, i],
+            'third_place_pct': seed_pct[2, i],
+            'points_for_leader_pct': (aggregate.points_leader_counts[i] / num_simulations) * 100,
             'current_wins': team_stats[team]['wins'],
             'current_points': team_stats[team]['points_for'],
-            'win_distribution': wins_array,
-            'points_distribution': points_array,
-            'standing_distribution': standings_array,
-            'wins_mean': wins_array.mean(),
-            'wins_std': wins_array.std(),
-            'wins_mode': int(pd.Series(wins_array).mode().iloc[0]) if len(wins_array) > 0 else 0,
-            'points_mean': points_array.mean(),
-            'points_std': points_array.std(),
+            'win_distribution': sample.final_wins[:, i],
+            'points_distribution': sample.final_points[:, i],
+            'standing_distribution': sample.standings[:, i],
+            'wins_mean': wins_mean[i],
+            'wins_std': wins_std[i],
+            'wins_mode': int(wins_mode[i]),
+            'points_mean': aggregate.points_mean[i],
+            'points_std': points_std[i],
             'roster_health': team_stats[team].get('roster_health', 1.0),
             'variance_multiplier': team_stats[team].get('variance_multiplier', 1.0),
             'injury_impact': team_stats[team].get('injury_impact', 0.0),
@@ -1155,21 +1162,42 @@ def monte_carlo_playoff_simulation(summary, remaining_schedule, espn_projections
             'bye_players': bye_players_all.get(team, []),
             'unavailable_starters': unavailable_starters_all.get(team, []),
             'projection_weeks': weeks_count,
-            'fourth_place_pct': (fourth_place_counts[team] / num_simulations) * 100,
-            'playoff_given_win_pct': (playoff_given_win[team] / max(wins_count[team], 1)) * 100,
-            'playoff_given_loss_pct': (playoff_given_loss[team] / max(losses_count[team], 1)) * 100,
-            'week15_win_pct': (wins_count[team] / num_simulations) * 100,
-            'week15_scores': week15_scores.get(team, []),
+            'fourth_place_pct': seed_pct[3, i],
+            'playoff_given_win_pct': playoff_given_win[i] * 100,
+            'playoff_given_loss_pct': playoff_given_loss[i] * 100,
+            'week15_win_pct': (aggregate.game_wins[i] / num_simulations) * 100,
+            'week15_scores': sample.scores[:, model.slot_teams == i].ravel(),
+            'playoff_pct_ci': playoff_ci[i],
+            'championship_pct_ci': seed_ci[0][i],
+            'second_place_pct_ci': seed_ci[1][i],
+            'third_place_pct_ci': seed_ci[2][i],
+            'fourth_place_pct_ci': seed_ci[3][i],
+            'points_for_leader_pct_ci': points_leader_ci[i],
+            'exact_win_distribution': {w: p * 100 for w, p in zip(final_wins[i].tolist(), exact_wins.pmf[i].tolist())
+                                       if w <= bounds.max_wins[i]},
+            'playoff_pct_bounds': (float(playoff_floor[i]) * 100, float(playoff_ceiling[i]) * 100),
+            'clinched': bool(bounds.clinched[i]),
+            'eliminated': bool(bounds.eliminated[i]),
         }
     
     results['_simulation_meta'] = {
         'matchup_wins': matchup_wins,
         'simulation_results': simulation_results,
-        'num_simulations': num_simulations
+        'num_simulations': num_simulations,
+        'seed': aggregate.seed_entropy,
+        'max_stderr': aggregate.max_stderr(),
+        'converged': aggregate.converged,
+        'elapsed_seconds': aggregate.elapsed_seconds,
+        'variance_reduction': aggregate.variance_reduction_report(model),
+        'raw_results': aggregate.raw.arrays() if aggregate.raw is not None else None
     }
     
     return results
 
+def simulation_count(playoff_preds):
+    """Simulations actually run (adaptive runs choose their own count)."""
+    return playoff_preds.get('_simulation_meta', {}).get('num_simulations', NUM_SIMULATIONS)
+
 def create_monte_carlo_density_plots(playoff_preds, summary, espn_projections):
     """Create density distribution plots for wins and points for each team."""
     Path('visualizations/monte_carlo').mkdir(parents=True, exist_ok=True)
@@ -1277,7 +1305,7 @@ Health Rating:          {roster_health:.0f}%
                 verticalalignment='top', fontfamily='monospace',
                 bbox=dict(boxstyle='round', facecolor='#f8f9fa', alpha=0.9))
         
-        fig.suptitle(f'Monte Carlo Analysis: {team}\n({NUM_SIMULATIONS:,} Simulations | ESPN Projections + Historical Data)', 
+        fig.suptitle(f'Monte Carlo Analysis: {team}\n({simulation_count(playoff_preds):,} Simulations | ESPN Projections + Historical Data)', 
                     fontsize=14, fontweight='bold', y=1.02)
         plt.tight_layout()
         plt.savefig(f'visualizations/monte_carlo/{team.lower()}_monte_carlo.png', 
@@ -1346,7 +1374,7 @@ def create_combined_density_plot(playoff_preds, summary):
     ax2.set_title(f'Points For Projections\n(Critical for Playoff Seeding Tiebreaks)', fontsize=13, fontweight='bold', pad=15)
     ax2.grid(axis='x', alpha=0.3)
     
-    fig.suptitle(f'Monte Carlo Playoff Projections ({NUM_SIMULATIONS:,} Simulations)\nBlending ESPN Projections ({ESPN_PROJECTION_WEIGHT*100:.0f}%) + Historical Performance ({HISTORICAL_WEIGHT*100:.0f}%)', 
+    fig.suptitle(f'Monte Carlo Playoff Projections ({simulation_count(playoff_preds):,} Simulations)\nBlending ESPN Projections ({ESPN_PROJECTION_WEIGHT*100:.0f}%) + Historical Performance ({HISTORICAL_WEIGHT*100:.0f}%)', 
                 fontsize=14, fontweight='bold', y=1.02)
     
     from matplotlib.lines import Line2D
@@ -1641,7 +1669,7 @@ def create_visualizations(df, summary):
     plt.close()
     
     fig, ax = plt.subplots(figsize=(12, 8))
-    consistency = current_df.groupby('team_name').agg({
+    consistency = current_df.groupby('team_name', observed=True).agg({
         'weekly_rank': 'std',
         'points_for': 'std'
     }).reset_index()
@@ -1677,7 +1705,7 @@ def create_visualizations(df, summary):
     weekly_data = []
     for week in sorted(season_df['week'].unique()):
         week_df = season_df[season_df['week'] <= week].copy()
-        week_summary = week_df.groupby('team_name').agg({
+        week_summary = week_df.groupby('team_name', observed=True).agg({
             'wins': 'sum',
             'mvp_w': 'sum',
             'top6_wins': 'sum'
@@ -2068,6 +2096,11 @@ def generate_markdown_analysis(summary, remaining_schedule, game_predictions, pl
     """Generate dynamic markdown analysis with Monte Carlo methodology."""
     if optimized_lineups is None:
         optimized_lineups = {}
+    
+    num_simulations = simulation_count(playoff_preds)
+    max_ci_half_width = max([(pred['playoff_pct_ci'][1] - pred['playoff_pct_ci'][0]) / 2
+                             for team, pred in playoff_preds.items()
+                             if team != '_simulation_meta' and 'playoff_pct_ci' in pred], default=0)
     if playoff_scenarios is None:
         playoff_scenarios = {}
     
@@ -2229,7 +2262,7 @@ Teams with injured players have **increased scoring variance** in the simulation
 
 ### What We Track
 
-For each of the {NUM_SIMULATIONS:,} simulations, we record:
+For each of the {num_simulations:,} simulations, we record:
 1. **Final Win Total** - How many wins each team ends with
 2. **Final Points For** - Total season points (the tiebreaker for playoff seeding)
 3. **Final Standing** - Where each team finishes in the standings
@@ -2281,7 +2314,7 @@ The **#1 Seed %** column shows your probability of finishing as the **regular se
 
 ## Playoff Predictions
 
-Based on {NUM_SIMULATIONS:,} Monte Carlo simulations blending ESPN projections with historical data.
+Based on {num_simulations:,} Monte Carlo simulations blending ESPN projections with historical data (95% intervals on every playoff % are within ±{max_ci_half_width:.1f} points).
 
 | Team | Record | Playoff % | Most Likely Wins | Projected PF | Proj. Standing | #1 Seed % | PF Leader % |
 |------|--------|-----------|------------------|--------------|----------------|----------------|-------------|
@@ -2294,7 +2327,8 @@ Based on {NUM_SIMULATIONS:,} Monte Carlo simulations blending ESPN projections w
         wins = int(team_row['real_wins'])
         losses = weeks_played - wins
         pf_leader_pct = pred.get('points_for_leader_pct', 0)
-        md += f"| {team} | {wins}-{losses} | {pred['playoff_pct']:.1f}% | {pred['wins_mode']} | {pred['points_mean']:.0f} | #{pred['avg_standing']:.1f} | {pred['championship_pct']:.1f}% | {pf_leader_pct:.1f}% |\n"
+        playoff_cell = 'Clinched' if pred.get('clinched') else 'Eliminated' if pred.get('eliminated') else f"{pred['playoff_pct']:.1f}%"
+        md += f"| {team} | {wins}-{losses} | {playoff_cell} | {pred['wins_mode']} | {pred['points_mean']:.0f} | #{pred['avg_standing']:.1f} | {pred['championship_pct']:.1f}% | {pf_leader_pct:.1f}% |\n"
 
     md += """
 
@@ -2790,7 +2824,7 @@ Based on Monte Carlo simulation with ESPN projections and historical performance
 
 ---
 
-*Analysis generated by ESPN Fantasy Football Scraper using {NUM_SIMULATIONS:,} Monte Carlo simulations. May your players stay healthy and your opponents' stars have bye weeks.*
+*Analysis generated by ESPN Fantasy Football Scraper using {num_simulations:,} Monte Carlo simulations. May your players stay healthy and your opponents' stars have bye weeks.*
 """
     
     with open(filename, 'w') as f:
@@ -2824,16 +2858,29 @@ def main():
     print("[4/8] Fetching ESPN projections, roster health, lineup optimization, and FAAB...")
     espn_projections, roster_health, optimized_lineups = fetch_espn_projections(remaining_schedule)
     
-    from espn_api import ESPNFantasyAPI
-    import os
-    api = ESPNFantasyAPI(149388, 2025, os.environ.get('ESPN_S2'), os.environ.get('SWID'))
-    faab_data = api.get_faab_spending()
+    faab_data = get_espn_api().get_faab_spending()
     print(f"  FAAB spent: ${faab_data['total_spent']} total | Points-For prize: ${faab_data['pf_prize']:.0f}")
     
-    print(f"[5/8] Running Monte Carlo simulations ({NUM_SIMULATIONS:,} iterations)...")
+    if SIMULATION_TOLERANCE:
+        print(f"[5/8] Running Monte Carlo simulations (adaptive: stderr <= {SIMULATION_TOLERANCE:.2%}, up to {MAX_SIMULATIONS:,})...")
+    else:
+        print(f"[5/8] Running Monte Carlo simulations ({NUM_SIMULATIONS:,} iterations)...")
     print(f"  Blending: Optimized Projections ({ESPN_PROJECTION_WEIGHT*100:.0f}%) + Historical ({HISTORICAL_WEIGHT*100:.0f}%)")
     print(f"  Lineup optimization: BYE week substitutions + injury replacements")
     playoff_preds = monte_carlo_playoff_simulation(summary, remaining_schedule, espn_projections, roster_health, optimized_lineups)
+    sim_meta = playoff_preds['_simulation_meta']
+    if SIMULATION_TOLERANCE:
+        outcome = 'converged' if sim_meta['converged'] else 'stopped at the simulation/time limit'
+        print(f"  Ran {sim_meta['num_simulations']:,} simulations in {sim_meta['elapsed_seconds']:.1f}s ({outcome}, max stderr {sim_meta['max_stderr']:.2%})")
+    variance_reduction = sim_meta['variance_reduction']
+    if 'antithetic_gain' in variance_reduction:
+        print(f"  Antithetic draws: {variance_reduction['antithetic_gain']:.2f}x effective sample size "
+              f"(~{variance_reduction['effective_simulations']:,} independent simulations)")
+    if 'common_random_numbers_gain' in variance_reduction:
+        print(f"  Common random numbers: {variance_reduction['common_random_numbers_gain']:.2f}x effective sample size for given-win/loss swings")
+    clinched = [t for t, p in playoff_preds.items() if t != '_simulation_meta' and p['clinched']]
+    eliminated = [t for t, p in playoff_preds.items() if t != '_simulation_meta' and p['eliminated']]
+    print(f"  Clinched: {', '.join(clinched) or 'none'} | Eliminated: {', '.join(eliminated) or 'none'}")
     
     print("[6/8] Predicting remaining games (using optimized projections)...")
     game_predictions = predict_remaining_games(summary, remaining_schedule, espn_projections, optimized_lineups)
@@ -2879,7 +2926,7 @@ Generated Files:
     - visualizations/monte_carlo/*.png ({len(playoff_preds)} team plots)
 
 Monte Carlo Settings:
-    - Simulations: {NUM_SIMULATIONS:,}
+    - Simulations: {simulation_count(playoff_preds):,}
     - ESPN Projection Weight: {ESPN_PROJECTION_WEIGHT*100:.0f}%
     - Historical Weight: {HISTORICAL_WEIGHT*100:.0f}%
     - Tiebreaker: Points For
@@ -0,0 +1,28 @@
+"""Checkpoint restore: roll back half-written units, but never truncate rewritten files."""
+from checkpoint import CheckpointManifest
+
+RUN_KEY = {'league_id': 1, 'years': [2024], 'week': None, 'format': 'csv'}
+
+def committed_manifest(tmp_path):
+    (tmp_path / 'matchups.csv').write_text('season,week\n2024,1\n')
+    checkpoint = CheckpointManifest(str(tmp_path), RUN_KEY)
+    checkpoint.commit([(2024, 1)], ['matchups.csv'])
+    reloaded = CheckpointManifest(str(tmp_path), RUN_KEY)
+    assert reloaded.load()
+    return reloaded
+
+def test_restore_truncates_an_uncommitted_append(tmp_path):
+    checkpoint = committed_manifest(tmp_path)
+    with open(tmp_path / 'matchups.csv', 'a') as f:
+        f.write('2024,2\n2024,')
+
+    assert checkpoint.restore(['matchups.csv'])
+    assert (tmp_path / 'matchups.csv').read_text() == 'season,week\n2024,1\n'
+
+def test_restore_leaves_a_rewritten_file_alone(tmp_path):
+    checkpoint = committed_manifest(tmp_path)
+    rewritten = 'season,week\n2023,9\n2024,1\n2024,2\n'
+    (tmp_path / 'matchups.csv').write_text(rewritten)
+
+    assert not checkpoint.restore(['matchups.csv'])
+    assert (tmp_path / 'matchups.csv').read_text() == rewritten
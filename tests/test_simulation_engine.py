@@ -0,0 +1,55 @@
+"""Reproducibility checks for the chunked, multi-process Monte Carlo engine."""
+import numpy as np
+import pytest
+
+import simulation_engine
+from simulation_engine import build_season_model, run_adaptive, run_simulations
+
+def make_model(num_teams=10, weeks=(13, 14, 15), seed=7):
+    rng = np.random.default_rng(seed)
+    teams = [f"Team {i}" for i in range(num_teams)]
+    team_stats = {team: {'wins': int(rng.integers(3, 10)), 'points_for': float(rng.uniform(1300, 1700)),
+                         'ppg': float(rng.uniform(95, 125)), 'std': float(rng.uniform(12, 25))}
+                  for team in teams}
+    schedule = []
+    for week in weeks:
+        order = rng.permutation(num_teams)
+        schedule += [{'week': week, 'home': teams[order[k]], 'away': teams[order[k + 1]]}
+                     for k in range(0, num_teams, 2)]
+    return build_season_model(team_stats, schedule, {}, {}, 0.6, 0.4)
+
+@pytest.mark.parametrize('num_simulations', [10000, 3001])
+def test_same_seed_is_identical_for_any_worker_count(num_simulations, monkeypatch):
+    monkeypatch.setattr(simulation_engine, 'MIN_POOL_SIMULATIONS', 0)
+    model = make_model()
+    inline = run_simulations(model, num_simulations, seed=42, workers=1)
+    pooled = run_simulations(model, num_simulations, seed=42, workers=2)
+
+    assert inline.num_simulations == pooled.num_simulations == num_simulations
+    np.testing.assert_array_equal(inline.playoff_counts, pooled.playoff_counts)
+    np.testing.assert_array_equal(inline.seed_counts, pooled.seed_counts)
+    np.testing.assert_array_equal(inline.points_leader_counts, pooled.points_leader_counts)
+    np.testing.assert_array_equal(inline.sample.index, pooled.sample.index)
+
+def test_adaptive_run_is_identical_for_any_worker_count(monkeypatch):
+    monkeypatch.setattr(simulation_engine, 'MIN_POOL_SIMULATIONS', 0)
+    model = make_model()
+    inline = run_adaptive(model, 0.01, 50000, seed=3, workers=1)
+    pooled = run_adaptive(model, 0.01, 50000, seed=3, workers=2)
+
+    assert inline.num_simulations == pooled.num_simulations
+    np.testing.assert_array_equal(inline.seed_counts, pooled.seed_counts)
+
+def test_different_seeds_differ():
+    model = make_model()
+    first = run_simulations(model, 4000, seed=1)
+    second = run_simulations(model, 4000, seed=2)
+    assert not np.array_equal(first.seed_counts, second.seed_counts)
+
+def test_small_runs_skip_the_process_pool(monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("process pool started for a small run")
+    monkeypatch.setattr(simulation_engine, 'ProcessPoolExecutor', no_pool)
+    model = make_model()
+    run_simulations(model, 10000, seed=1, workers=4)
+    run_adaptive(model, 0.01, 50000, seed=1, workers=4)
@@ -0,0 +1,128 @@
+"""Exact final-win distributions and clinch/elimination bounds for a SeasonModel."""
+import numpy as np
+from dataclasses import dataclass
+from scipy.special import ndtr
+from typing import List
+
+from simulation_engine import SeasonModel
+
+def game_win_probabilities(model: SeasonModel) -> np.ndarray:
+    """
+    P(home team wins) for every remaining game.
+
+    Uses the same closed form as predict_remaining_games, applied to the model's own
+    means and spreads, so injuries and lineup confidence are included just as in the
+    simulations. The MIN_SCORE floor is left out. It only matters when both teams
+    score under it, which is around a 1-in-10,000 event.
+    """
+    mean, std = model.mean.reshape(-1, 2), model.std.reshape(-1, 2)
+    diff_std = np.sqrt((std ** 2).sum(axis=1))
+    diff_std[diff_std == 0] = 10
+    return ndtr((mean[:, 0] - mean[:, 1]) / diff_std)  # norm.cdf without the distribution-object overhead
+
+@dataclass
+class WinDistribution:
+    """
+    Each team's final-win distribution, ignoring how ties in the standings break.
+
+    Game results are independent, so a team's remaining wins follow a Poisson-binomial
+    distribution. pmf[t, k] is P(team t wins exactly k more games).
+    """
+    teams: List[str]
+    current_wins: np.ndarray
+    pmf: np.ndarray
+
+    def final_wins(self) -> np.ndarray:
+        """Final win total matching each pmf column, per team."""
+        return self.current_wins[:, None] + np.arange(self.pmf.shape[1])
+
+    def mean(self) -> np.ndarray:
+        return (self.pmf * self.final_wins()).sum(axis=1)
+
+    def std(self) -> np.ndarray:
+        squared = (self.pmf * self.final_wins() ** 2).sum(axis=1)
+        return np.sqrt(np.maximum(squared - self.mean() ** 2, 0))
+
+    def mode(self) -> np.ndarray:
+        return self.current_wins + self.pmf.argmax(axis=1)
+
+    def prob_at_least(self, final_wins: np.ndarray) -> np.ndarray:
+        """P(final wins >= final_wins[t]) per team."""
+        return (self.pmf * (self.final_wins() >= np.asarray(final_wins)[:, None])).sum(axis=1)
+
+def win_distribution(model: SeasonModel, home_win_prob: np.ndarray = None) -> WinDistribution:
+    """
+    Convolve every team's remaining games into its exact win distribution.
+
+    Each game shifts the winner's pmf by one win with its win probability: O(games x
+    remaining games per team) arithmetic, which takes microseconds for a season. A
+    week's games are applied together when no team plays twice in it.
+    """
+    if home_win_prob is None:
+        home_win_prob = game_win_probabilities(model)
+    games_left = np.bincount(model.slot_teams, minlength=model.num_teams)
+    pmf = np.zeros((model.num_teams, int(games_left.max(initial=0)) + 1))
+    pmf[:, 0] = 1.0
+
+    win_prob = np.column_stack([home_win_prob, 1 - home_win_prob]).ravel()
+    slot_teams = model.slot_teams
+    slot_weeks = np.repeat(model.weeks, 2)
+    for week in dict.fromkeys(model.weeks.tolist()):
+        in_week = np.flatnonzero(slot_weeks == week)
+        rounds = [in_week] if len(np.unique(slot_teams[in_week])) == len(in_week) else [[slot] for slot in in_week]
+        for slots in rounds:
+            teams, win = slot_teams[slots], win_prob[slots][:, None]
+            rows = pmf[teams]
+            rows[:, 1:] = rows[:, 1:] * (1 - win) + rows[:, :-1] * win
+            rows[:, 0] *= 1 - win[:, 0]
+            pmf[teams] = rows
+
+    return WinDistribution(teams=model.teams, current_wins=model.current_wins, pmf=pmf)
+
+@dataclass
+class PlayoffBounds:
+    """
+    Final win totals that decide a team's playoff fate whatever the tiebreakers do.
+
+    safe_wins: finishing with this many wins clinches a playoff spot, because fewer
+    than playoff_spots other teams can reach that total. contention_wins: finishing
+    below this is elimination, because at least playoff_spots teams already have more.
+    Between the two the outcome depends on the other results and on points for.
+    """
+    safe_wins: np.ndarray
+    contention_wins: np.ndarray
+    min_wins: np.ndarray
+    max_wins: np.ndarray
+
+    @property
+    def clinched(self) -> np.ndarray:
+        return self.min_wins >= self.safe_wins
+
+    @property
+    def eliminated(self) -> np.ndarray:
+        return self.max_wins < self.contention_wins
+
+    def playoff_probability(self, distribution: WinDistribution):
+        """Exact (lower, upper) bounds on each team's playoff probability."""
+        return distribution.prob_at_least(self.safe_wins), distribution.prob_at_least(self.contention_wins)
+
+def playoff_bounds(model: SeasonModel, playoff_spots: int = 4) -> PlayoffBounds:
+    """Clinch and elimination thresholds from current wins and games left."""
+    games_left = np.bincount(model.slot_teams, minlength=model.num_teams)
+    min_wins = model.current_wins
+    max_wins = model.current_wins + games_left
+
+    if model.num_teams - 1 < playoff_spots:
+        zeros = np.zeros(model.num_teams, dtype=np.int64)
+        return PlayoffBounds(safe_wins=zeros, contention_wins=zeros, min_wins=min_wins, max_wins=max_wins)
+
+    # Row t holds every other team's totals, so the playoff_spots-th largest is one column
+    others = ~np.eye(model.num_teams, dtype=bool)
+
+    def kth_largest_of_others(totals):
+        other_totals = np.broadcast_to(totals, (model.num_teams, model.num_teams))[others].reshape(model.num_teams, -1)
+        return -np.sort(-other_totals, axis=1)[:, playoff_spots - 1]
+
+    return PlayoffBounds(safe_wins=kth_largest_of_others(max_wins) + 1,
+                         contention_wins=kth_largest_of_others(min_wins),
+                         min_wins=min_wins, max_wins=max_wins)